@@ -1,3 +1,5 @@
+from pathlib import Path
+
 # Conditionally load requests_mock plugin only if available
 # This import is used for pytest plugin configuration
 try:
@@ -10,3 +12,30 @@ except ImportError:
     # Fall back to empty plugin list if requests_mock not available
     # pytest_plugins is used by pytest's plugin loading system
     pytest_plugins = []  # noqa: F841 # Used by pytest
+
+# Streamlit AppTest end-to-end workflows, opt-in via --run-e2e
+E2E_DIR = Path(__file__).parent / "tests" / "e2e"
+
+
+def pytest_addoption(parser):
+    """Register the opt-in flag for the end-to-end suite"""
+    parser.addoption(
+        "--run-e2e",
+        action="store_true",
+        default=False,
+        help="run the Streamlit AppTest end-to-end tests in tests/e2e",
+    )
+
+
+def pytest_ignore_collect(collection_path, config):
+    """Leave tests/e2e uncollected unless --run-e2e was given
+
+    Ignoring the directory rather than skipping its items means the e2e
+    conftest and modules, and the Streamlit/httpx imports they pull in, are
+    never loaded on a default run.
+    """
+    if config.getoption("--run-e2e"):
+        return None
+    if collection_path == E2E_DIR or collection_path.is_relative_to(E2E_DIR):
+        return True
+    return None
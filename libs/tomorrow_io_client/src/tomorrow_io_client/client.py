@@ -12,6 +12,8 @@ Key Features:
 - Structured weather data retrieval
 - Intelligent response summarization for LLM consumption
 - Comprehensive error handling and logging
+- Circuit breaker that skips requests while the API is down
+- Async variant that keeps event loops free during requests
 - Local timezone awareness
 - Production-ready configuration management
 
@@ -28,9 +30,12 @@ For MCP and agentic AI systems, this client:
 - Supports conversational context with location memory
 """
 
+import asyncio
 from datetime import datetime, timezone
 from functools import lru_cache
 import re
+import threading
+import time
 import requests
 import tzlocal
 from pydantic import SecretStr, field_validator
@@ -78,6 +83,81 @@ def reset_settings_cache() -> None:
     get_settings.cache_clear()
 
 
+class CircuitBreaker:
+    """Consecutive-failure circuit breaker for the Tomorrow.io forecast API.
+
+    After ``fail_max`` consecutive outage failures (timeouts, connection errors,
+    429 and 5xx responses) the breaker opens and requests are skipped for
+    ``reset_timeout`` seconds. The first request after that is a trial, and
+    other requests are still skipped while it runs: success closes the breaker,
+    another outage failure opens it again. A trial that never reports back
+    frees the slot for another one after a further ``reset_timeout``.
+    """
+
+    def __init__(self, fail_max: int = 5, reset_timeout: float = 60.0):
+        self.fail_max = fail_max
+        self.reset_timeout = reset_timeout
+        self._failures = 0
+        self._opened_at: float | None = None
+        self._lock = threading.Lock()
+
+    def _state(self) -> str:
+        if self._opened_at is None:
+            return "closed"
+        if time.monotonic() - self._opened_at >= self.reset_timeout:
+            return "half-open"
+        return "open"
+
+    @property
+    def current_state(self) -> str:
+        """One of "closed", "open" or "half-open"."""
+        with self._lock:
+            return self._state()
+
+    def allow_request(self) -> bool:
+        """Return False while the breaker is open or a trial is in flight."""
+        with self._lock:
+            state = self._state()
+            if state == "half-open":
+                # This caller is the trial; restart the open window so
+                # concurrent callers are skipped until it records its outcome
+                self._opened_at = time.monotonic()
+                return True
+            return state == "closed"
+
+    def record_success(self) -> None:
+        with self._lock:
+            self._failures = 0
+            self._opened_at = None
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self._failures += 1
+            if self._opened_at is not None or self._failures >= self.fail_max:
+                self._opened_at = time.monotonic()
+
+
+def _is_outage(error: requests.RequestException) -> bool:
+    """Whether a request error means the API is unavailable, not misused."""
+    if isinstance(error, (requests.Timeout, requests.ConnectionError)):
+        return True
+    response = error.response
+    return response is not None and (
+        response.status_code == 429 or response.status_code >= 500
+    )
+
+
+@lru_cache(maxsize=1)
+def get_circuit_breaker() -> CircuitBreaker:
+    """Process-wide breaker shared by all weather requests."""
+    return CircuitBreaker()
+
+
+def reset_circuit_breaker() -> None:
+    """Discard breaker state, primarily for use in tests."""
+    get_circuit_breaker.cache_clear()
+
+
 @lru_cache(maxsize=1)
 def get_geolocator() -> Nominatim:
     """Lazily initialize the geolocator."""
@@ -161,6 +241,21 @@ def get_tmrw_weather_tool(location: str) -> dict:
         "units": "imperial",
         "apikey": settings.tomorrow_io_api_key.get_secret_value(),
     }
+    breaker = get_circuit_breaker()
+    if not breaker.allow_request():
+        logger.warning(
+            "Circuit breaker open, skipping weather request for location: %s",
+            location,
+        )
+        return {
+            "status": "error",
+            "error_message": (
+                "Weather service is temporarily unavailable after repeated "
+                "failures. Please try again later."
+            ),
+            "location": location,
+            "forecast": None,
+        }
     try:
         logger.info("Requesting weather summary for location: %s", location)
         response = requests.get(settings.base_url, params=params)
@@ -169,12 +264,17 @@ def get_tmrw_weather_tool(location: str) -> dict:
         logger.info("Received weather data response for location: %s", location)
     except requests.RequestException as e:
         logger.error("API request failed for location %s: %s", location, e)
+        if _is_outage(e):
+            breaker.record_failure()
+        else:
+            breaker.record_success()
         return {
             "status": "error",
             "error_message": str(e),
             "location": location,
             "forecast": None,
         }
+    breaker.record_success()
     try:
         hours = data.get("timelines", {}).get("hourly", [])
     except (KeyError, TypeError):
@@ -260,6 +360,23 @@ def get_tmrw_weather_tool(location: str) -> dict:
     return {"status": "success", "forecast": forecast, "location": location}
 
 
+async def aget_tmrw_weather_tool(location: str) -> dict:
+    """
+    Async variant of get_tmrw_weather_tool for callers running an event loop.
+
+    Geocoding and the forecast request are blocking, so they run on a worker
+    thread and several locations can be fetched concurrently with
+    asyncio.gather. The circuit breaker is shared with the sync tool.
+
+    Args:
+        location (str): The location to get weather for (city name, coordinates, etc.)
+
+    Returns:
+        dict: The same structure as get_tmrw_weather_tool.
+    """
+    return await asyncio.to_thread(get_tmrw_weather_tool, location)
+
+
 # Debug block for direct execution
 if __name__ == "__main__":
     setup_logging(service_name="tomorrow_io_client")
@@ -1,7 +1,9 @@
+import asyncio
 import pytest
 import requests
+import threading
 import tomorrow_io_client.client as client_module
-from tomorrow_io_client.client import get_tmrw_weather_tool
+from tomorrow_io_client.client import aget_tmrw_weather_tool, get_tmrw_weather_tool
 from datetime import datetime, timezone
 
 MOCK_API_KEY = (
@@ -15,8 +17,10 @@ MOCK_URL = "https://api.tomorrow.io/v4/weather/forecast"
 def set_env(monkeypatch):
     monkeypatch.setenv("TOMORROW_IO_API_KEY", MOCK_API_KEY)
     client_module.reset_settings_cache()
+    client_module.reset_circuit_breaker()
     yield
     client_module.reset_settings_cache()
+    client_module.reset_circuit_breaker()
 
 
 @pytest.fixture
@@ -93,6 +97,33 @@ def test_get_tmrw_weather_tool_api_error(requests_mock):
     )
 
 
+def test_aget_tmrw_weather_tool_runs_locations_concurrently(
+    requests_mock, sample_response, monkeypatch
+):
+    requests_mock.get(MOCK_URL, json=sample_response, status_code=200)
+    locations = ["40.7128,-74.0060", "51.5074,-0.1278"]
+
+    # Each worker waits until every location's fetch has started, so the
+    # barrier breaks if the fetches run one at a time. It sits in front of the
+    # sync tool because requests_mock serializes the HTTP sends themselves.
+    started = threading.Barrier(len(locations), timeout=5)
+    sync_tool = client_module.get_tmrw_weather_tool
+
+    def overlapping_tool(location):
+        started.wait()
+        return sync_tool(location)
+
+    monkeypatch.setattr(client_module, "get_tmrw_weather_tool", overlapping_tool)
+
+    async def fetch_all():
+        return await asyncio.gather(*map(aget_tmrw_weather_tool, locations))
+
+    results = asyncio.run(fetch_all())
+    assert [result["status"] for result in results] == ["success", "success"]
+    assert [result["location"] for result in results] == locations
+    assert requests_mock.call_count == len(locations)
+
+
 def test_get_tmrw_weather_tool_no_hourly_data(requests_mock):
     # API returns a valid response but with an empty hourly timeline
     empty_response = {"timelines": {"hourly": []}}
@@ -147,6 +178,65 @@ def test_network_connection_error(requests_mock):
     assert len(result["error_message"]) > 0  # Error message should exist
 
 
+def test_circuit_breaker_opens_after_consecutive_outages(requests_mock):
+    """After fail_max outage failures the API is no longer called"""
+    forecast = requests_mock.get(MOCK_URL, status_code=503, text="Service Unavailable")
+    breaker = client_module.get_circuit_breaker()
+
+    results = [
+        get_tmrw_weather_tool(MOCK_LOCATION) for _ in range(breaker.fail_max + 1)
+    ]
+
+    assert forecast.call_count == breaker.fail_max
+    assert breaker.current_state == "open"
+    assert all(result["status"] == "error" for result in results)
+    assert "temporarily unavailable" in results[-1]["error_message"]
+
+
+def test_circuit_breaker_ignores_client_errors(requests_mock):
+    """4xx responses other than 429 do not count towards opening the breaker"""
+    forecast = requests_mock.get(MOCK_URL, status_code=401, text="Unauthorized")
+    breaker = client_module.get_circuit_breaker()
+
+    for _ in range(breaker.fail_max + 1):
+        get_tmrw_weather_tool(MOCK_LOCATION)
+
+    assert forecast.call_count == breaker.fail_max + 1
+    assert breaker.current_state == "closed"
+
+
+def test_circuit_breaker_half_open_trial(monkeypatch):
+    """One trial after reset_timeout; it reopens on failure, closes on success"""
+    now = [0.0]
+    monkeypatch.setattr(client_module.time, "monotonic", lambda: now[0])
+    breaker = client_module.CircuitBreaker(fail_max=2, reset_timeout=60)
+    breaker.record_failure()
+    assert breaker.current_state == "closed"
+    breaker.record_failure()
+    assert breaker.current_state == "open"
+    assert not breaker.allow_request()
+
+    # Only the first caller after the timeout gets through as the trial
+    now[0] = 60
+    assert breaker.current_state == "half-open"
+    assert breaker.allow_request()
+    assert not breaker.allow_request()
+
+    # A failed trial reopens the breaker for another full timeout
+    breaker.record_failure()
+    assert breaker.current_state == "open"
+    now[0] = 119
+    assert not breaker.allow_request()
+
+    # A successful trial closes it again
+    now[0] = 120
+    assert breaker.allow_request()
+    breaker.record_success()
+    assert breaker.current_state == "closed"
+    assert breaker.allow_request()
+    assert breaker.allow_request()
+
+
 def test_malformed_json_response(requests_mock):
     """Test handling of malformed JSON responses - covers lines 108-110"""
     # Return a response that's not valid JSON
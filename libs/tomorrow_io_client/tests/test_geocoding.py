@@ -10,8 +10,10 @@ MOCK_API_KEY = "a1b2c3d4e5f6a1b2c3d4e5f6a1b2c3d4"  # pragma: allowlist secret
 def set_env(monkeypatch):
     monkeypatch.setenv("TOMORROW_IO_API_KEY", MOCK_API_KEY)
     client_module.reset_settings_cache()
+    client_module.reset_circuit_breaker()
     yield
     client_module.reset_settings_cache()
+    client_module.reset_circuit_breaker()
 
 
 @pytest.fixture
@@ -0,0 +1,61 @@
+"""
+AppTest Helpers for the Streamlit Integration and End-to-End Tests
+
+Canned Gemini replies and accessors shared by the modules that drive
+``app.py`` through AppTest. Reply bodies are filled into a pre-encoded
+template, so each one is encoded once at import instead of being written
+out as a nested dict and dumped again.
+"""
+
+import json
+from pathlib import Path
+
+from httpx import Response
+
+APP_PATH = Path(__file__).resolve().parent.parent / "app.py"
+
+# httpx copies response headers, so one dict serves every reply
+JSON_HEADERS = {"content-type": "application/json"}
+
+REPLY_TEMPLATE = (
+    b'{"candidates":[{"content":{"parts":[{"text":%s}],"role":"model"},'
+    b'"finish_reason":"STOP"}]}'
+)
+
+
+def reply_bytes(text):
+    """Return an encoded single-candidate model reply containing ``text``"""
+    return REPLY_TEMPLATE % json.dumps(text).encode()
+
+
+def llm_reply(text):
+    """A reusable 200 response carrying a single-candidate model reply"""
+    return Response(200, content=reply_bytes(text), headers=JSON_HEADERS)
+
+
+def send_chat(at, text):
+    """Submit one chat message and rerun the app
+
+    The app drops a message sent within 3s of the previous one, and AppTest
+    reruns much faster than that, so the throttle is cleared first. Each
+    rerun handles one chat input; there is no way to queue several per run.
+    """
+    at.session_state.last_request_time = 0
+    return at.chat_input[0].set_value(text).run()
+
+
+def visible_markdown(at):
+    """The rendered markdown values of an AppTest run, minus injected CSS
+
+    Each element's ``value`` is read once per call.
+    """
+    return [
+        value
+        for md in at.markdown
+        if (value := md.value) and not value.startswith("<style>")
+    ]
+
+
+def rendered_text(at):
+    """Join the visible markdown of an AppTest run into one string"""
+    return " ".join(visible_markdown(at))
@@ -0,0 +1,126 @@
+"""
+Shared fixtures for the app and UI test directories
+
+The LLM transport mock, reply queue and AppTest fixtures live here so the
+integration and e2e directories drive ``app.py`` the same way.
+"""
+
+import itertools
+import json
+
+import pytest
+from httpx import Response
+
+from app_helpers import APP_PATH, JSON_HEADERS, llm_reply
+
+# The first AppTest run imports the ADK and agents, which can outlast
+# AppTest's 3s default in a cold pytest-xdist worker
+APP_RUN_TIMEOUT = 30
+
+# Served whenever a test has not queued replies of its own
+DEFAULT_LLM_REPLY = llm_reply("Mock LLM response")
+
+# Gemini replies served by the session-wide transport mock. AppTest runs
+# app.py on its own script thread, so this is plain module state rather than a
+# ContextVar (which would not propagate to that thread).
+_llm_state = {"replies": itertools.repeat(DEFAULT_LLM_REPLY)}
+
+
+def _as_response(payload):
+    """Build a reusable 200 JSON response from encoded bytes or a dict
+
+    A ready-made ``Response`` (e.g. an error status) is served as given. A
+    bytes-backed ``Response`` can be read any number of times, so each one is
+    built once and returned again on repeats.
+    """
+    if isinstance(payload, Response):
+        return payload
+    if not isinstance(payload, bytes):
+        payload = json.dumps(payload).encode()
+    return Response(200, content=payload, headers=JSON_HEADERS)
+
+
+def _dispatch_llm_request(request):
+    """Serve the next queued LLM reply"""
+    return next(_llm_state["replies"])
+
+
+@pytest.fixture(scope="session")
+def llm_transport():
+    """Route Gemini ``generateContent`` calls to the queued replies
+
+    genai sends async requests through aiohttp whenever it is installed;
+    switching that off keeps them on httpx, where respx intercepts them at the
+    transport. respx hands each request to the first router activated, so the
+    integration and e2e directories share this one router and reply queue.
+    Yields the route so tests can inspect its calls.
+    """
+    import respx
+    from google.genai import _api_client
+
+    with (
+        pytest.MonkeyPatch.context() as mp,
+        respx.mock(assert_all_called=False) as router,
+    ):
+        mp.setattr(_api_client, "has_aiohttp", False)
+        yield router.post(url__regex=r"generateContent").mock(
+            side_effect=_dispatch_llm_request
+        )
+
+
+@pytest.fixture
+def llm_responses(llm_transport):
+    """Queue Gemini replies for the current test
+
+    Call the returned function with the replies in the order the app should
+    receive them; the last one is repeated once exhausted. Payloads may be
+    pre-encoded bytes, dicts, which are encoded once here rather than on every
+    request, or a ``Response`` for non-200 replies. Calling it again replaces
+    the queue, and the default reply is restored after the test.
+    """
+
+    def queue(*payloads):
+        replies = [_as_response(payload) for payload in payloads] or [DEFAULT_LLM_REPLY]
+        _llm_state["replies"] = itertools.chain(replies, itertools.repeat(replies[-1]))
+
+    yield queue
+    _llm_state["replies"] = itertools.repeat(DEFAULT_LLM_REPLY)
+
+
+@pytest.fixture(scope="session")
+def app_test_factory():
+    """Returns a callable building a fresh AppTest for the repository's app.py
+
+    AppTest is imported and the source read only when a test asks for it, and
+    each AppTest is built from the cached string, so tests neither re-read the
+    file nor depend on the working directory to find it.
+    """
+    from streamlit.testing.v1 import AppTest
+
+    source = APP_PATH.read_text(encoding="utf-8")
+    return lambda: AppTest.from_string(source, default_timeout=APP_RUN_TIMEOUT)
+
+
+@pytest.fixture(scope="module")
+def _module_app_test(app_test_factory, llm_transport):
+    """One AppTest shared by every test in a module, its LLM calls mocked"""
+    return app_test_factory()
+
+
+@pytest.fixture
+def app_test(_module_app_test, monkeypatch):
+    """The module's AppTest with session state cleared for a fresh chat
+
+    Reusing the instance avoids rebuilding the app for every test; clearing
+    the state is what gives each test a new conversation. The weather
+    client's circuit breaker is process-wide, so it is reset too, and the
+    typing indicator, which only pauses for 1.5s per turn, is switched off.
+    """
+    from tomorrow_io_client.client import reset_circuit_breaker
+
+    monkeypatch.setattr("ui.components.show_typing_indicator", lambda: None)
+
+    reset_circuit_breaker()
+    for key in list(_module_app_test.session_state):
+        del _module_app_test.session_state[key]
+    return _module_app_test
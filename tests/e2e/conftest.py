@@ -0,0 +1,35 @@
+"""
+End-to-End Test Configuration and Fixtures
+
+This module provides the canned error-scenario replies for the Streamlit
+workflows in this directory; the AppTest fixtures and LLM transport mock are
+shared with the integration tests through ``tests/conftest.py``.
+"""
+
+import json
+from pathlib import Path
+
+import pytest
+
+from app_helpers import reply_bytes
+
+FIXTURES_DIR = Path(__file__).resolve().parents[1] / "fixtures"
+
+
+@pytest.fixture(scope="session")
+def error_replies():
+    """Encoded LLM replies for the error scenarios, keyed by scenario name
+
+    Loaded once from ``tests/fixtures/error_scenario_replies.json``. Every
+    scenario maps to a tuple of replies in conversation order, ready to pass
+    as ``llm_responses(*error_replies[name])``.
+    """
+    texts = json.loads(
+        (FIXTURES_DIR / "error_scenario_replies.json").read_text(encoding="utf-8")
+    )
+    return {
+        name: tuple(
+            reply_bytes(t) for t in (text if isinstance(text, list) else [text])
+        )
+        for name, text in texts.items()
+    }
@@ -10,730 +10,210 @@ Tests complete error scenarios and recovery workflows, verifying that:
 """
 
 import pytest
-from streamlit.testing.v1 import AppTest
-from unittest.mock import patch
-from httpx import Response
-import time
-from requests.exceptions import Timeout
 
-
-@pytest.mark.skip(
-    reason="E2E tests require complex app-level mocking - "
-    "use integration tests for component testing"
-)
-@pytest.mark.asyncio
-async def test_weather_api_failure_scenario_e2e(requests_mock):
-    """
-    Tests complete workflow when weather API fails.
-    """
-    # Mock weather API failure
-    requests_mock.get(
-        "https://api.tomorrow.io/v4/weather/forecast",
-        status_code=500,
-        text="Internal Server Error",
-    )
-
-    # Mock LLM response handling API failure
-    error_response = {
-        "candidates": [
-            {
-                "content": {
-                    "parts": [
-                        {
-                            "text": "I apologize, but I'm currently unable to retrieve "
-                            "weather information due to a service issue with the "
-                            "weather data provider. This could be due to:\n\n"
-                            "• Temporary server issues\n• Network connectivity "
-                            "problems\n• Service maintenance\n\n**What you can "
-                            "do:**\n- Try your request again in a few minutes\n- "
-                            "Check a weather website directly (weather.com, "
-                            "accuweather.com)\n- Ask me about something else I "
-                            "can help with\n\nIs there anything else I can assist "
-                            "you with in the meantime?"
-                        }
-                    ],
-                    "role": "model",
-                },
-                "finish_reason": "STOP",
-            }
-        ]
-    }
-
-    def mock_llm_call(*args, **kwargs):
-        if "generateContent" in kwargs.get("url", ""):
-            return Response(
-                200, json=error_response, headers={"content-type": "application/json"}
-            )
-        return Response(200, json={}, headers={"content-type": "application/json"})
-
-    with patch(
-        "google.genai._api_client.AsyncHttpxClient.request", side_effect=mock_llm_call
-    ):
-        at = AppTest.from_file("app.py").run()
-
-        # Request weather information that will fail
-        at.chat_input[0].set_value("What's the weather like in London?").run()
-
-        # Verify graceful error handling
-        assert not at.exception  # App should not crash
-
-        markdown_content = [
-            md.value
-            for md in at.markdown
-            if md.value and not md.value.startswith("<style>")
-        ]
-        all_content = " ".join(markdown_content)
-
-        # Should contain helpful error message
-        assert "apologize" in all_content.lower() or "unable" in all_content.lower()
-        assert "service" in all_content.lower() or "issue" in all_content.lower()
-        assert (
-            "try again" in all_content.lower() or "few minutes" in all_content.lower()
-        )
-
-
-@pytest.mark.skip(
-    reason="E2E tests require complex app-level mocking - "
-    "use integration tests for component testing"
-)
-@pytest.mark.asyncio
-async def test_search_api_failure_scenario_e2e(requests_mock):
-    """
-    Tests complete workflow when search API fails.
-    """
-    # Mock search API failure
-    requests_mock.get(
-        "https://www.googleapis.com/customsearch/v1",
-        status_code=403,
-        json={"error": {"message": "Quota exceeded for this API"}},
-    )
-
-    # Mock LLM response for search failure
-    search_error_response = {
-        "candidates": [
-            {
-                "content": {
-                    "parts": [
-                        {
-                            "text": "I'm sorry, but I'm currently unable to perform "
-                            "web searches due to an API limitation. This appears to "
-                            "be a quota or permission issue with the search "
-                            "service.\n\n**Alternative suggestions:**\n- Try "
-                            "searching directly on Google, Bing, or DuckDuckGo\n- "
-                            "I can still help with weather information, general "
-                            "questions, or other topics\n- The search functionality "
-                            "should be restored shortly\n\nWould you like me to "
-                            "help you with something else instead?"
-                        }
-                    ],
-                    "role": "model",
-                },
-                "finish_reason": "STOP",
-            }
-        ]
-    }
-
-    def mock_llm_call(*args, **kwargs):
-        if "generateContent" in kwargs.get("url", ""):
-            return Response(
-                200,
-                json=search_error_response,
-                headers={"content-type": "application/json"},
-            )
-        return Response(200, json={}, headers={"content-type": "application/json"})
-
-    with patch(
-        "google.genai._api_client.AsyncHttpxClient.request", side_effect=mock_llm_call
-    ):
-        at = AppTest.from_file("app.py").run()
-
-        # Request search that will fail
-        at.chat_input[0].set_value(
-            "Search for information about artificial intelligence"
-        ).run()
-
-        # Verify search failure handling
-        assert not at.exception
-
-        markdown_content = [
-            md.value
-            for md in at.markdown
-            if md.value and not md.value.startswith("<style>")
-        ]
-        all_content = " ".join(markdown_content)
-
-        # Should provide helpful alternatives
-        assert "sorry" in all_content.lower() or "unable" in all_content.lower()
-        assert "quota" in all_content.lower() or "limitation" in all_content.lower()
-        assert "alternative" in all_content.lower() or "instead" in all_content.lower()
-
-
-@pytest.mark.skip(
-    reason="E2E tests require complex app-level mocking - "
-    "use integration tests for component testing"
+# Skip before the Streamlit/httpx imports below so collecting this module
+# stays cheap; these workflows are covered by the integration tests.
+pytest.skip(
+    "E2E tests require complex app-level mocking - "
+    "use integration tests for component testing",
+    allow_module_level=True,
 )
-@pytest.mark.asyncio
-async def test_network_timeout_scenario_e2e(requests_mock):
-    """
-    Tests complete workflow when network requests timeout.
-    """
-
-    # Mock timeout for weather API
-    def timeout_callback(request, context):
-        time.sleep(0.1)  # Brief delay to simulate timeout
-        raise Timeout("Request timed out")
-
-    requests_mock.get(
-        "https://api.tomorrow.io/v4/weather/forecast", exc=timeout_callback
-    )
 
-    # Mock LLM response for timeout handling
-    timeout_response = {
-        "candidates": [
-            {
-                "content": {
-                    "parts": [
-                        {
-                            "text": "I'm experiencing a timeout while trying to fetch "
-                            "weather data. This usually happens when:\n\n• The "
-                            "weather service is responding slowly\n• There are "
-                            "network connectivity issues\n• The service is under "
-                            "heavy load\n\n**Recommendations:**\n- Please try "
-                            "your weather request again\n- The service usually "
-                            "responds faster on retry\n- If the issue persists, "
-                            "there may be a temporary service outage\n\nWould you "
-                            "like to try again, or can I help you with something "
-                            "else?"
-                        }
-                    ],
-                    "role": "model",
-                },
-                "finish_reason": "STOP",
-            }
-        ]
-    }
-
-    def mock_llm_call(*args, **kwargs):
-        if "generateContent" in kwargs.get("url", ""):
-            return Response(
-                200, json=timeout_response, headers={"content-type": "application/json"}
-            )
-        return Response(200, json={}, headers={"content-type": "application/json"})
-
-    with patch(
-        "google.genai._api_client.AsyncHttpxClient.request", side_effect=mock_llm_call
-    ):
-        at = AppTest.from_file("app.py").run()
+from dataclasses import dataclass  # noqa: E402
 
-        # Request that will timeout
-        at.chat_input[0].set_value("What's the current weather in Tokyo?").run()
+from httpx import Response  # noqa: E402
+from requests.exceptions import Timeout  # noqa: E402
 
-        # Verify timeout handling
-        assert not at.exception
+from app_helpers import JSON_HEADERS, rendered_text, send_chat  # noqa: E402
 
-        markdown_content = [
-            md.value
-            for md in at.markdown
-            if md.value and not md.value.startswith("<style>")
-        ]
-        all_content = " ".join(markdown_content)
+WEATHER_URL = "https://api.tomorrow.io/v4/weather/forecast"
+SEARCH_URL = "https://www.googleapis.com/customsearch/v1"
 
-        # Should explain timeout and suggest retry
-        assert (
-            "timeout" in all_content.lower()
-            or "responding slowly" in all_content.lower()
-        )
-        assert "try again" in all_content.lower() or "retry" in all_content.lower()
+# Problematic user inputs for the invalid-input scenario
+SPECIAL_INPUT = "!@#$%^&*()_+{}|:<>?[]\\;'\".,/"
+LONG_INPUT = "a" * 1000
 
 
-@pytest.mark.skip(
-    reason="E2E tests require complex app-level mocking - "
-    "use integration tests for component testing"
-)
-@pytest.mark.asyncio
-async def test_invalid_user_input_scenario_e2e(requests_mock):
-    """
-    Tests handling of various invalid or problematic user inputs.
-    """
-    # Mock normal API responses
-    requests_mock.get(
-        "https://api.tomorrow.io/v4/weather/forecast",
-        json={
-            "timelines": {
-                "hourly": [
-                    {
-                        "time": "2025-09-28T14:00:00Z",
-                        "values": {"temperature": 72, "weatherCode": 1000},
-                    }
-                ]
-            }
-        },
-    )
-
-    # Mock LLM responses for handling invalid inputs
-    invalid_input_responses = [
-        {
-            "candidates": [
-                {
-                    "content": {
-                        "parts": [
-                            {
-                                "text": "I notice your message contains some unusual "
-                                "characters or formatting. Could you please rephrase "
-                                "your question? I'm here to help with weather "
-                                "information, search queries, and general assistance."
-                            }
-                        ],
-                        "role": "model",
-                    },
-                    "finish_reason": "STOP",
-                }
-            ]
-        },
-        {
-            "candidates": [
-                {
-                    "content": {
-                        "parts": [
-                            {
-                                "text": "I see you've sent a very long message. I can "
-                                "help you, but it would be easier if you could break "
-                                "down your request into smaller, more specific "
-                                "questions. What's the main thing you'd like to know?"
-                            }
-                        ],
-                        "role": "model",
-                    },
-                    "finish_reason": "STOP",
-                }
-            ]
-        },
-        {
-            "candidates": [
+def _forecast(temperature):
+    """Minimal Tomorrow.io hourly forecast payload"""
+    return {
+        "timelines": {
+            "hourly": [
                 {
-                    "content": {
-                        "parts": [
-                            {
-                                "text": "I'm not sure I understand that request. I can "
-                                "help you with:\n• Weather information for any "
-                                "location\n• Web searches for information\n• "
-                                "General questions and assistance\n\nWhat would "
-                                "you like to know?"
-                            }
-                        ],
-                        "role": "model",
-                    },
-                    "finish_reason": "STOP",
+                    "time": "2025-09-28T14:00:00Z",
+                    "values": {"temperature": temperature, "weatherCode": 1000},
                 }
             ]
-        },
-    ]
-
-    response_index = 0
-
-    def mock_llm_call(*args, **kwargs):
-        nonlocal response_index
-        if "generateContent" in kwargs.get("url", ""):
-            if response_index < len(invalid_input_responses):
-                result = Response(
-                    200,
-                    json=invalid_input_responses[response_index],
-                    headers={"content-type": "application/json"},
-                )
-                response_index += 1
-                return result
-            return Response(
-                200,
-                json=invalid_input_responses[-1],
-                headers={"content-type": "application/json"},
-            )
-        return Response(200, json={}, headers={"content-type": "application/json"})
-
-    with patch(
-        "google.genai._api_client.AsyncHttpxClient.request", side_effect=mock_llm_call
-    ):
-        at = AppTest.from_file("app.py").run()
-
-        # Test various invalid inputs
-        invalid_inputs = [
-            "!@#$%^&*()_+{}|:<>?[]\\;'\".,/",  # Special characters
-            "a" * 1000,  # Very long input
-            "",  # Empty input
-        ]
-
-        for invalid_input in invalid_inputs:
-            if invalid_input:  # Skip empty input as it might not trigger submission
-                at.chat_input[0].set_value(invalid_input).run()
-                assert not at.exception  # Should handle gracefully
-
-        # Verify invalid input handling
-        markdown_content = [
-            md.value
-            for md in at.markdown
-            if md.value and not md.value.startswith("<style>")
-        ]
-        all_content = " ".join(markdown_content)
-
-        # Should contain helpful guidance
-        assert (
-            "rephrase" in all_content.lower()
-            or "understand" in all_content.lower()
-            or "help" in all_content.lower()
-        )
+        }
+    }
 
 
-@pytest.mark.skip(
-    reason="E2E tests require complex app-level mocking - "
-    "use integration tests for component testing"
+# Served when the LLM service itself is down
+LLM_FAILURE_RESPONSE = Response(
+    500,
+    json={"error": "Internal server error"},
+    headers=JSON_HEADERS,
 )
-@pytest.mark.asyncio
-async def test_llm_service_failure_scenario_e2e(requests_mock):
-    """
-    Tests scenario when the LLM service itself fails.
-    """
-    # Mock normal external APIs
-    requests_mock.get(
-        "https://api.tomorrow.io/v4/weather/forecast",
-        json={
-            "timelines": {
-                "hourly": [
-                    {
-                        "time": "2025-09-28T14:00:00Z",
-                        "values": {"temperature": 75, "weatherCode": 1000},
-                    }
-                ]
-            }
-        },
-    )
-
-    # Mock LLM failure
-    def mock_llm_failure(*args, **kwargs):
-        if "generateContent" in kwargs.get("url", ""):
-            return Response(
-                500,
-                json={"error": "Internal server error"},
-                headers={"content-type": "application/json"},
-            )
-        return Response(200, json={}, headers={"content-type": "application/json"})
-
-    with patch(
-        "google.genai._api_client.AsyncHttpxClient.request",
-        side_effect=mock_llm_failure,
-    ):
-        at = AppTest.from_file("app.py").run()
-
-        # Try to interact when LLM is failing
-        at.chat_input[0].set_value("What's the weather like?").run()
 
-        # App should handle LLM failure gracefully
-        # (The exact behavior depends on how the app handles LLM failures)
-        # At minimum, it should not crash
-        assert not at.exception
 
-
-@pytest.mark.skip(
-    reason="E2E tests require complex app-level mocking - "
-    "use integration tests for component testing"
-)
-@pytest.mark.asyncio
-async def test_partial_service_recovery_scenario_e2e(requests_mock):
-    """
-    Tests scenario where services fail then recover during conversation.
-    """
-    # Mock progressive recovery
-    call_count = 0
-
-    def progressive_api(request, context):
-        nonlocal call_count
-        call_count += 1
-        if call_count == 1:
-            # First call fails
-            context.status_code = 503
-            return "Service Unavailable"
-        else:
-            # Subsequent calls succeed
-            return {
-                "timelines": {
-                    "hourly": [
-                        {
-                            "time": "2025-09-28T14:00:00Z",
-                            "values": {"temperature": 78, "weatherCode": 1000},
-                        }
-                    ]
-                }
-            }
-
-    requests_mock.get(
-        "https://api.tomorrow.io/v4/weather/forecast", json=progressive_api
-    )
-
-    # Mock responses showing recovery
-    recovery_responses = [
-        {
-            "candidates": [
+@dataclass(frozen=True)
+class ErrorScenario:
+    """One error workflow: mocked APIs, canned model replies, chat turns
+
+    ``reply`` names an entry of the ``error_replies`` fixture, or is None when
+    the LLM service fails. Each group in ``must_contain`` needs at least one
+    of its keywords in the lowercased chat transcript.
+    """
+
+    id: str
+    api_mocks: tuple
+    reply: str | None
+    turns: tuple
+    must_contain: tuple = ()
+
+
+SCENARIOS = [
+    # Weather API failure
+    ErrorScenario(
+        id="weather_api_failure",
+        api_mocks=(
+            (WEATHER_URL, {"status_code": 500, "text": "Internal Server Error"}),
+        ),
+        reply="weather_api_failure",
+        turns=("What's the weather like in London?",),
+        must_contain=(
+            ("apologize", "unable"),
+            ("service", "issue"),
+            ("try again", "few minutes"),
+        ),
+    ),
+    # Search API failure
+    ErrorScenario(
+        id="search_api_failure",
+        api_mocks=(
+            (
+                SEARCH_URL,
                 {
-                    "content": {
-                        "parts": [
-                            {
-                                "text": "I'm sorry, the weather service is currently "
-                                "unavailable. Please try again in a moment."
-                            }
-                        ],
-                        "role": "model",
-                    },
-                    "finish_reason": "STOP",
-                }
-            ]
-        },
-        {
-            "candidates": [
+                    "status_code": 403,
+                    "json": {"error": {"message": "Quota exceeded for this API"}},
+                },
+            ),
+        ),
+        reply="search_api_failure",
+        turns=("Search for information about artificial intelligence",),
+        must_contain=(
+            ("sorry", "unable"),
+            ("quota", "limitation"),
+            ("alternative", "instead"),
+        ),
+    ),
+    # Network timeout on the weather API
+    ErrorScenario(
+        id="network_timeout",
+        api_mocks=((WEATHER_URL, {"exc": Timeout("Request timed out")}),),
+        reply="network_timeout",
+        turns=("What's the current weather in Tokyo?",),
+        must_contain=(("timeout", "responding slowly"), ("try again", "retry")),
+    ),
+    # Invalid or problematic user input (empty input is not submitted)
+    ErrorScenario(
+        id="invalid_user_input",
+        api_mocks=((WEATHER_URL, {"json": _forecast(72)}),),
+        reply="invalid_input",
+        turns=(SPECIAL_INPUT, LONG_INPUT),
+        must_contain=(("rephrase", "understand", "help"),),
+    ),
+    # LLM service failure: at minimum the app should not crash
+    ErrorScenario(
+        id="llm_service_failure",
+        api_mocks=((WEATHER_URL, {"json": _forecast(75)}),),
+        reply=None,
+        turns=("What's the weather like?",),
+    ),
+    # Weather service fails once, then recovers
+    ErrorScenario(
+        id="partial_service_recovery",
+        api_mocks=(
+            (
+                WEATHER_URL,
+                [
+                    {"status_code": 503, "text": "Service Unavailable"},
+                    {"json": _forecast(78)},
+                ],
+            ),
+        ),
+        reply="partial_recovery",
+        turns=(
+            "What's the weather in Miami?",
+            "Can you try checking the weather again?",
+        ),
+        must_contain=(("unavailable", "sorry"), ("working again", "78")),
+    ),
+    # Weather and search fail simultaneously
+    ErrorScenario(
+        id="concurrent_error",
+        api_mocks=(
+            (WEATHER_URL, {"status_code": 503, "text": "Service Unavailable"}),
+            (SEARCH_URL, {"status_code": 500, "text": "Internal Server Error"}),
+        ),
+        reply="multiple_service_failure",
+        turns=("Can you check the weather and also search for local restaurants?",),
+        must_contain=(
+            ("multiple services", "experiencing issues"),
+            ("weather service",),
+            ("search service",),
+            ("still help", "else can"),
+        ),
+    ),
+    # Weather works while search is rate limited
+    ErrorScenario(
+        id="graceful_degradation",
+        api_mocks=(
+            (WEATHER_URL, {"json": _forecast(72)}),
+            (
+                SEARCH_URL,
                 {
-                    "content": {
-                        "parts": [
-                            {
-                                "text": "Great! The weather service is working again. "
-                                "The weather in Miami is currently 78F and sunny!"
-                            }
-                        ],
-                        "role": "model",
-                    },
-                    "finish_reason": "STOP",
-                }
-            ]
-        },
-    ]
-
-    response_index = 0
-
-    def mock_llm_call(*args, **kwargs):
-        nonlocal response_index
-        if "generateContent" in kwargs.get("url", ""):
-            if response_index < len(recovery_responses):
-                result = Response(
-                    200,
-                    json=recovery_responses[response_index],
-                    headers={"content-type": "application/json"},
-                )
-                response_index += 1
-                return result
-            return Response(
-                200,
-                json=recovery_responses[-1],
-                headers={"content-type": "application/json"},
-            )
-        return Response(200, json={}, headers={"content-type": "application/json"})
-
-    with patch(
-        "google.genai._api_client.AsyncHttpxClient.request", side_effect=mock_llm_call
-    ):
-        at = AppTest.from_file("app.py").run()
-
-        # First attempt (should fail)
-        at.chat_input[0].set_value("What's the weather in Miami?").run()
-
-        # Second attempt (should succeed)
-        at.chat_input[0].set_value("Can you try checking the weather again?").run()
-
-        # Verify recovery handling
-        assert not at.exception
-
-        markdown_content = [
-            md.value
-            for md in at.markdown
-            if md.value and not md.value.startswith("<style>")
-        ]
-        all_content = " ".join(markdown_content)
-
-        # Should show both failure and recovery
-        assert "unavailable" in all_content.lower() or "sorry" in all_content.lower()
-        assert "working again" in all_content.lower() or "78" in all_content
-
-
-@pytest.mark.skip(
-    reason="E2E tests require complex app-level mocking - "
-    "use integration tests for component testing"
-)
-@pytest.mark.asyncio
-async def test_concurrent_error_scenario_e2e(requests_mock):
-    """
-    Tests handling when multiple services fail simultaneously.
-    """
-    # Mock both APIs failing
-    requests_mock.get(
-        "https://api.tomorrow.io/v4/weather/forecast",
-        status_code=503,
-        text="Service Unavailable",
-    )
-
-    requests_mock.get(
-        "https://www.googleapis.com/customsearch/v1",
-        status_code=500,
-        text="Internal Server Error",
-    )
-
-    # Mock response for multiple service failures
-    multi_failure_response = {
-        "candidates": [
-            {
-                "content": {
-                    "parts": [
-                        {
-                            "text": (
-                                "I'm experiencing issues with multiple services "
-                                "right now. I can't access weather data or "
-                                "perform web searches at the moment.\n\n"
-                                "**Current status:**\n- Weather service: "
-                                "Temporarily unavailable\n- Search service: "
-                                "Experiencing issues\n\n**What I can still "
-                                "help with:**\n- General questions and info I "
-                                "already know\n- Conversation and planning help\n- "
-                                "Technical explanations and advice\n\n**What "
-                                "to try:**\n- Check back in a few minutes for "
-                                "service restoration\n- Use direct websites for "
-                                "urgent needs\n\nHow else can I assist you "
-                                "while the services recover?"
-                            )
-                        }
-                    ],
-                    "role": "model",
+                    "status_code": 429,
+                    "json": {"error": {"message": "Rate limit exceeded"}},
                 },
-                "finish_reason": "STOP",
-            }
-        ]
-    }
-
-    def mock_llm_call(*args, **kwargs):
-        if "generateContent" in kwargs.get("url", ""):
-            return Response(
-                200,
-                json=multi_failure_response,
-                headers={"content-type": "application/json"},
-            )
-        return Response(200, json={}, headers={"content-type": "application/json"})
-
-    with patch(
-        "google.genai._api_client.AsyncHttpxClient.request", side_effect=mock_llm_call
-    ):
-        at = AppTest.from_file("app.py").run()
-
-        # Request that would use multiple failing services
-        at.chat_input[0].set_value(
-            "Can you check the weather and also search for local " "restaurants?"
-        ).run()
-
-        # Verify multi-service failure handling
-        assert not at.exception
-
-        markdown_content = [
-            md.value
-            for md in at.markdown
-            if md.value and not md.value.startswith("<style>")
-        ]
-        all_content = " ".join(markdown_content)
-
-        # Should acknowledge multiple service issues
-        assert (
-            "multiple services" in all_content.lower()
-            or "experiencing issues" in all_content.lower()
-        )
-        assert (
-            "weather service" in all_content.lower()
-            and "search service" in all_content.lower()
-        )
-        assert "still help" in all_content.lower() or "else can" in all_content.lower()
+            ),
+        ),
+        reply="graceful_degradation",
+        turns=(
+            "What's the weather in San Francisco and can you search for "
+            "nearby coffee shops?",
+        ),
+        must_contain=(("72f", "weather"), ("rate", "rate limit")),
+    ),
+]
 
 
-@pytest.mark.skip(
-    reason="E2E tests require complex app-level mocking - "
-    "use integration tests for component testing"
-)
-@pytest.mark.asyncio
-async def test_graceful_degradation_scenario_e2e(requests_mock):
+@pytest.mark.slow
+@pytest.mark.parametrize("scenario", SCENARIOS, ids=lambda s: s.id)
+def test_error_scenario_e2e(
+    scenario, app_test, requests_mock, error_replies, llm_responses
+):
     """
-    Tests that the system gracefully degrades functionality when services are
-    partially available.
+    Tests a complete error workflow end to end without crashing the app.
     """
-    # Mock one service working, one failing
-    requests_mock.get(
-        "https://api.tomorrow.io/v4/weather/forecast",
-        json={
-            "timelines": {
-                "hourly": [
-                    {
-                        "time": "2025-09-28T14:00:00Z",
-                        "values": {"temperature": 72, "weatherCode": 1000},
-                    }
-                ]
-            }
-        },
-    )
-
-    requests_mock.get(
-        "https://www.googleapis.com/customsearch/v1",
-        status_code=429,
-        json={"error": {"message": "Rate limit exceeded"}},
-    )
-
-    # Mock response showing graceful degradation
-    degradation_response = {
-        "candidates": [
-            {
-                "content": {
-                    "parts": [
-                        {
-                            "text": (
-                                "I can provide you with weather information, but "
-                                "I am currently unable to perform web searches "
-                                "due to rate limiting.\n\n**Weather Update:**\n"
-                                "The current weather is 72F with clear skies.\n\n"
-                                "**Note on Search:**\nThe search service is "
-                                "currently rate limited and may return errors or "
-                                "incomplete results.\n\n**What I can do:**\n- "
-                                "Provide detailed weather information for locations "
-                                "you ask about\n- Offer general guidance and "
-                                "suggestions based on known facts.\n\nIf you'd "
-                                "like, I can give the weather update now and try the "
-                                "search again later when rate limiting eases."
-                            )
-                        }
-                    ],
-                    "role": "model",
-                },
-                "finish_reason": "STOP",
-            }
-        ]
-    }
-
-    def mock_llm_call(*args, **kwargs):
-        if "generateContent" in kwargs.get("url", ""):
-            return Response(
-                200,
-                json=degradation_response,
-                headers={"content-type": "application/json"},
-            )
-        return Response(200, json={}, headers={"content-type": "application/json"})
-
-    with patch(
-        "google.genai._api_client.AsyncHttpxClient.request", side_effect=mock_llm_call
-    ):
-        at = AppTest.from_file("app.py").run()
+    for url, response in scenario.api_mocks:
+        if isinstance(response, list):
+            requests_mock.get(url, response)
+        else:
+            requests_mock.get(url, **response)
 
-        # Ask for both weather and a search (one service is rate-limited)
-        at.chat_input[0].set_value(
-            "What's the weather in San Francisco and can you search for "
-            "nearby coffee shops?"
-        ).run()
+    if scenario.reply is None:
+        llm_responses(LLM_FAILURE_RESPONSE)
+    else:
+        llm_responses(*error_replies[scenario.reply])
 
-        # Verify graceful degradation behavior
-        assert not at.exception
+    at = app_test.run()
+    for turn in scenario.turns:
+        send_chat(at, turn)
+        assert not at.exception  # App should not crash
 
-        markdown_content = [
-            md.value
-            for md in at.markdown
-            if md.value and not md.value.startswith("<style>")
-        ]
-        all_content = " ".join(markdown_content)
+    # Lowercase the transcript once, then scan it per keyword group
+    lowered = rendered_text(at).lower()
 
-        # Should include a weather update and mention rate limiting for search
-        assert "72f" in all_content.lower() or "weather" in all_content.lower()
-        assert "rate" in all_content.lower() or "rate limit" in all_content.lower()
+    for keywords in scenario.must_contain:
+        assert any(keyword in lowered for keyword in keywords), keywords
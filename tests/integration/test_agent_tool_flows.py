@@ -8,318 +8,131 @@ Tests the integration between agents and their tools, verifying that:
 - Tool responses are properly processed by agents
 """
 
+from datetime import datetime, timezone
+
 import pytest
-from unittest.mock import patch
 
-TEST_TOMORROW_IO_API_KEY = (
-    "test_api_key_for_agent_tool_flows_1234567890"  # pragma: allowlist secret
-)
+WEATHER_URL = "https://api.tomorrow.io/v4/weather/forecast"
+NYC_COORDINATES = "40.7128,-74.0060"
 
 
-@pytest.mark.asyncio
-async def test_supervisor_delegates_to_day_planner(
-    supervisor_agent, setup_api_mocks, mock_google_adk_client
-):
-    """
-    Tests that the supervisor agent correctly delegates a weather-related query
-    to the day_planner agent.
-    """
-    # Mock the supervisor's LLM response to delegate to day planner
-    {
-        "candidates": [
-            {
-                "content": {
-                    "parts": [
-                        {
-                            "text": "I'll help you check the weather. Let me use the "
-                            "day planner to get current weather information."
-                        }
-                    ],
-                    "role": "model",
-                },
-                "finish_reason": "STOP",
-            }
-        ]
+def _todays_afternoon_forecast(temperature):
+    """Tomorrow.io payload with two clear afternoon hours in today's local time"""
+    local_now = datetime.now().astimezone()
+    return {
+        "timelines": {
+            "hourly": [
+                {
+                    "time": local_now.replace(
+                        hour=hour, minute=0, second=0, microsecond=0
+                    )
+                    .astimezone(timezone.utc)
+                    .isoformat(),
+                    "values": {
+                        "temperature": temperature,
+                        "precipitationProbability": 10,
+                        "cloudCover": 0,
+                    },
+                }
+                for hour in (13, 14)
+            ]
+        }
     }
 
-    # Test the supervisor agent creation and basic functionality
-    assert supervisor_agent is not None
-    assert supervisor_agent.name == "supervisor_agent"
-    assert (
-        len(supervisor_agent.tools) >= 2
-    )  # Should have day_planner and google_search tools
-
-    # Verify supervisor has the expected sub-agent tools
-    tool_names = [tool.name for tool in supervisor_agent.tools]
-    assert "day_planner_agent" in tool_names
-    assert "basic_search_agent" in tool_names
-
-
-@pytest.mark.asyncio
-async def test_day_planner_agent_uses_weather_tool(
-    day_planner_agent, setup_api_mocks, mock_google_adk_client
-):
-    """
-    Tests that the day_planner agent correctly uses the get_tmrw_weather_tool.
-    """
-    # Verify day planner agent configuration
-    assert day_planner_agent is not None
-    assert day_planner_agent.name == "day_planner_agent"
-    assert len(day_planner_agent.tools) == 1  # Should have weather tool
-
-    # Verify the weather tool is present
-    weather_tool = day_planner_agent.tools[0]
-    assert weather_tool.__name__ == "get_tmrw_weather_tool"
-
-    # Test that the tool can be called (with mocked API)
-    try:
-        # This would normally trigger an API call, but our mocks should intercept it
-        result = weather_tool(location="New York")
-        # Should return mocked weather data
-        assert result is not None
-    except Exception:
-        # If direct tool call fails due to complex agent internals,
-        # we can still verify the tool is properly attached
-        assert callable(weather_tool)
-
 
-@pytest.mark.asyncio
-async def test_google_search_agent_uses_search_tool(
-    google_search_agent, setup_api_mocks, mock_google_adk_client
-):
+@pytest.mark.parametrize(
+    "agent_fixture,expected_name,expected_tools",
+    [
+        # The supervisor delegates to its sub-agents through agent tools
+        (
+            "supervisor_agent",
+            "supervisor_agent",
+            {"day_planner_agent", "basic_search_agent", "home_assistant_agent"},
+        ),
+        ("day_planner_agent", "day_planner_agent", {"get_tmrw_weather_tool"}),
+        ("google_search_agent", "basic_search_agent", {"google_search"}),
+    ],
+    ids=["supervisor", "day_planner", "google_search"],
+)
+def test_agent_configuration(request, agent_fixture, expected_name, expected_tools):
     """
-    Tests that the google_search_agent correctly uses Google search tools.
+    Tests that each agent is built with its expected name and tools.
     """
-    # Verify google search agent configuration
-    assert google_search_agent is not None
-    assert google_search_agent.name == "basic_search_agent"
-    assert len(google_search_agent.tools) >= 1  # Should have search tool(s)
-
-    # Verify search tool is present
-    search_tools = [
-        tool
-        for tool in google_search_agent.tools
-        if hasattr(tool, "name") and "search" in tool.name.lower()
-    ]
-    if not search_tools:
-        search_tools = [
-            tool
-            for tool in google_search_agent.tools
-            if hasattr(tool, "__class__")
-            and "search" in tool.__class__.__name__.lower()
-        ]
+    agent = request.getfixturevalue(agent_fixture)
 
-    assert search_tools
+    assert agent.name == expected_name
+    # Agent and ADK tools expose .name; plain function tools only __name__
+    tool_names = {getattr(tool, "name", None) or tool.__name__ for tool in agent.tools}
+    assert tool_names == expected_tools
 
-    search_tool = search_tools[0]
-    assert search_tool is not None
-    # For GoogleSearchTool objects, just verify it's a tool object
-    assert hasattr(search_tool, "__class__")
-    assert "Tool" in search_tool.__class__.__name__
 
-
-@pytest.mark.asyncio
-async def test_weather_tool_integration_with_api(
-    day_planner_agent, mock_tomorrow_io_response, setup_api_mocks
-):
+def test_weather_tool_integration_with_api(day_planner_agent, requests_mock):
     """
     Tests the complete integration between day planner agent and Tomorrow.io API.
     """
-    # Get the weather tool from day planner
+    requests_mock.get(WEATHER_URL, json=_todays_afternoon_forecast(75))
     weather_tool = day_planner_agent.tools[0]
 
-    with patch.dict(
-        "os.environ",
-        {"TOMORROW_IO_API_KEY": TEST_TOMORROW_IO_API_KEY},  # pragma: allowlist secret
-    ):
-        try:
-            # Test tool execution with mocked API
-            result = weather_tool(location="New York, NY")
+    # Coordinates skip geocoding, so the only HTTP call is the mocked forecast
+    result = weather_tool(location=NYC_COORDINATES)
 
-            # Verify result contains expected weather data structure
-            if result is not None:
-                # Check if result is a string (formatted response) or dict
-                if isinstance(result, str):
-                    assert result
-                elif isinstance(result, dict):
-                    # Should contain weather information
-                    assert any(
-                        key in str(result).lower()
-                        for key in ["temperature", "weather", "temp"]
-                    )
-
-        except Exception:
-            # If tool execution fails due to complex integration,
-            # verify the tool is properly configured
-            assert weather_tool.__name__ == "get_tmrw_weather_tool"
-            assert callable(weather_tool)
+    assert result == {
+        "status": "success",
+        "forecast": (
+            "Today's forecast - Afternoon (12pm-5pm): Avg 75F, 10% rain chance, "
+            "sunny."
+        ),
+        "location": NYC_COORDINATES,
+    }
+    assert requests_mock.last_request.qs["location"] == [NYC_COORDINATES]
 
 
-@pytest.mark.asyncio
-async def test_search_tool_integration_with_api(
-    google_search_agent, mock_google_search_response, setup_api_mocks
-):
-    """
-    Tests the complete integration between google search agent and Google Search API.
+def test_search_tool_is_model_side_grounding(google_search_tool):
     """
-    # Get search tools from google search agent
-    search_tools = [
-        tool
-        for tool in google_search_agent.tools
-        if hasattr(tool, "name") and "search" in tool.name.lower()
-    ]
-    if not search_tools:
-        search_tools = [
-            tool
-            for tool in google_search_agent.tools
-            if hasattr(tool, "__class__")
-            and "search" in tool.__class__.__name__.lower()
-        ]
+    Tests that the google search agent uses ADK's built-in Google Search tool.
 
-    if search_tools:
-        search_tool = search_tools[0]
-
-        # Mock environment variable for API key
-        with patch.dict(
-            "os.environ",
-            {
-                "GOOGLE_API_KEY": "test_key",  # pragma: allowlist secret
-            },
-        ):
-            try:
-                # Test tool execution with mocked API
-                if callable(search_tool):
-                    result = search_tool(query="Paris attractions")
-                elif hasattr(search_tool, "search"):
-                    result = search_tool.search(query="Paris attractions")
-                else:
-                    result = None
+    That tool is executed by Gemini as grounding rather than called by the
+    client, so there is no client-side search request to mock or run here.
+    """
+    from google.adk.tools import google_search
 
-                # Verify result contains expected search data structure
-                if result is not None:
-                    if isinstance(result, str):
-                        assert result
-                    elif isinstance(result, dict):
-                        # Should contain search results
-                        assert any(
-                            key in str(result).lower()
-                            for key in ["results", "items", "title"]
-                        )
+    if google_search_tool is None:
+        pytest.skip("no search tool present")
 
-            except Exception:
-                # If tool execution fails due to complex integration,
-                # verify the tool is properly configured
-                assert hasattr(search_tool, "__class__")
-                assert "Tool" in search_tool.__class__.__name__
+    assert google_search_tool is google_search
+    assert not callable(google_search_tool)
 
 
-@pytest.mark.asyncio
-async def test_agent_tool_error_handling(day_planner_agent, requests_mock):
+def test_agent_tool_error_handling(day_planner_agent, requests_mock):
     """
     Tests that agents properly handle tool errors and API failures.
     """
     # Mock API to return error response
-    requests_mock.get(
-        "https://api.tomorrow.io/v4/weather/forecast",
-        status_code=500,
-        text="Internal Server Error",
-    )
+    requests_mock.get(WEATHER_URL, status_code=500, text="Internal Server Error")
 
     weather_tool = day_planner_agent.tools[0]
 
-    with patch.dict(
-        "os.environ",
-        {"TOMORROW_IO_API_KEY": TEST_TOMORROW_IO_API_KEY},  # pragma: allowlist secret
-    ):
-        try:
-            # This should handle the error gracefully
-            result = weather_tool(location="Invalid Location")
+    # The tool reports the failure instead of raising
+    result = weather_tool(location=NYC_COORDINATES)
 
-            # Tool should either return an error message or None, not crash
-            if result is not None:
-                assert isinstance(result, (str, dict))
-                if isinstance(result, str):
-                    # Error messages should be informative
-                    assert result
+    assert result["status"] == "error"
+    assert "500" in result["error_message"]
+    assert result["location"] == NYC_COORDINATES
+    assert result["forecast"] is None
 
-        except Exception as e:
-            # If exceptions are raised, they should be informative
-            assert isinstance(e, Exception)
-            assert str(e)
 
-
-@pytest.mark.asyncio
-async def test_tool_response_format_consistency(
-    day_planner_agent, google_search_agent, setup_api_mocks
-):
+def test_tool_response_format_consistency(day_planner_agent, setup_api_mocks):
     """
     Tests that tool responses follow consistent formats for agent consumption.
     """
-    # Test weather tool response format
     weather_tool = day_planner_agent.tools[0]
 
-    with patch.dict(
-        "os.environ",
-        {"TOMORROW_IO_API_KEY": TEST_TOMORROW_IO_API_KEY},  # pragma: allowlist secret
-    ):
-        try:
-            weather_result = weather_tool(location="New York")
-
-            if weather_result is not None:
-                assert isinstance(weather_result, (str, dict))
-
-                if isinstance(weather_result, str):
-                    # String responses should be non-empty and readable
-                    assert weather_result.strip()
-
-                elif isinstance(weather_result, dict):
-                    # Dict responses should have expected structure
-                    assert weather_result
+    # The shared payload is dated in the past, so this is the no-data path
+    result = weather_tool(location=NYC_COORDINATES)
 
-        except Exception:
-            # Tool configuration should at least be valid
-            assert weather_tool.__name__ == "get_tmrw_weather_tool"
-
-    # Test search tool response format
-    search_tools = [
-        tool
-        for tool in google_search_agent.tools
-        if hasattr(tool, "name") and "search" in tool.name.lower()
-    ]
-    if not search_tools:
-        # Fallback: inspect class names for 'search' in their name
-        search_tools = []
-        for tool in google_search_agent.tools:
-            if hasattr(tool, "__class__"):
-                cls_name = tool.__class__.__name__.lower()
-                if "search" in cls_name:
-                    search_tools.append(tool)
-
-    if search_tools:
-        search_tool = search_tools[0]
-
-        with patch.dict(
-            "os.environ",
-            {"GOOGLE_API_KEY": "test_key"},  # pragma: allowlist secret
-        ):
-            try:
-                if callable(search_tool):
-                    search_result = search_tool(query="test query")
-                elif hasattr(search_tool, "search"):
-                    search_result = search_tool.search(query="test query")
-                else:
-                    search_result = None
-
-                if search_result is not None:
-                    assert isinstance(search_result, (str, dict))
-
-                    if isinstance(search_result, str):
-                        assert search_result.strip()
-
-                    elif isinstance(search_result, dict):
-                        assert search_result
-
-            except Exception:
-                # Tool should at least be a valid tool object
-                assert hasattr(search_tool, "__class__")
-                assert "Tool" in search_tool.__class__.__name__
+    assert result == {
+        "status": "error",
+        "error_message": "No forecast data available for today.",
+        "location": NYC_COORDINATES,
+        "forecast": None,
+    }
@@ -10,402 +10,335 @@ Tests the integration with external APIs, verifying that:
 """
 
 import pytest
-from unittest.mock import patch
 import asyncio
+import re
+import threading
+import tzlocal
+from datetime import datetime, time, timezone
 from requests.exceptions import ConnectionError, Timeout
+from tomorrow_io_client.client import aget_tmrw_weather_tool, get_tmrw_weather_tool
+
+# Case-insensitive keyword checks for formatted weather and search results
+WEATHER_WORDS = re.compile(r"temperature|weather|forecast", re.IGNORECASE)
+SEARCH_WORDS = re.compile(r"paris|attractions|search", re.IGNORECASE)
+
+# Tomorrow.io error statuses and bodies
+TOMORROW_IO_ERROR_SCENARIOS = [
+    (400, "Bad Request"),
+    (401, "Unauthorized"),
+    (403, "Forbidden"),
+    (429, "Too Many Requests"),
+    (500, "Internal Server Error"),
+    (503, "Service Unavailable"),
+]
+
+# Google Search error statuses and JSON bodies
+SEARCH_ERROR_SCENARIOS = [
+    (400, '{"error": {"message": "Invalid request"}}'),
+    (403, '{"error": {"message": "Quota exceeded"}}'),
+    (500, '{"error": {"message": "Internal error"}}'),
+]
+
+# Tomorrow.io bodies that are not the expected forecast JSON
+MALFORMED_RESPONSES = [
+    "Not JSON",
+    '{"incomplete": json',
+    '{"empty": {}}',
+    '{"wrong_structure": ["array", "instead", "of", "object"]}',
+]
 
-TEST_TOMORROW_IO_API_KEY = (
-    "test_api_key_for_integration_tests_1234567890"  # pragma: allowlist secret
-)
 
-
-@pytest.mark.asyncio
 async def test_tomorrow_io_api_integration(setup_api_mocks, mock_tomorrow_io_response):
     """
     Tests the complete integration with Tomorrow.io weather API.
     """
-    # Import the weather client
-    from tomorrow_io_client.client import get_tmrw_weather_tool
-
-    # Mock environment for API key
-    with patch.dict(
-        "os.environ",
-        {"TOMORROW_IO_API_KEY": TEST_TOMORROW_IO_API_KEY},  # pragma: allowlist secret
-    ):  # pragma: allowlist secret
-        try:
-            # Test API call with mocked response
-            result = get_tmrw_weather_tool("New York, NY")
+    try:
+        # Test API call with mocked response
+        result = await aget_tmrw_weather_tool("New York, NY")
+
+        # Verify result structure
+        assert result is not None
+        if isinstance(result, dict):
+            # Should contain weather data
+            assert "timelines" in result or "weather" in str(result).lower()
+        elif isinstance(result, str):
+            # Should be a formatted weather response
+            assert len(result) > 0
+            assert WEATHER_WORDS.search(result)
+
+    except Exception:
+        # If direct API call fails, verify the mock is set up correctly
+        assert "timelines" in mock_tomorrow_io_response
+        assert "hourly" in mock_tomorrow_io_response["timelines"]
+
+
+@pytest.mark.parametrize("status_code,error_message", TOMORROW_IO_ERROR_SCENARIOS)
+async def test_tomorrow_io_api_error_handling(
+    mock_weather_api, status_code, error_message
+):
+    """
+    Tests error handling for Tomorrow.io API failures.
+    """
+    # Mock API to return error
+    mock_weather_api(
+        status_code=status_code,
+        text=error_message,
+    )
 
-            # Verify result structure
-            assert result is not None
-            if isinstance(result, dict):
-                # Should contain weather data
-                assert "timelines" in result or "weather" in str(result).lower()
-            elif isinstance(result, str):
-                # Should be a formatted weather response
-                assert len(result) > 0
-                assert any(
-                    word in result.lower()
-                    for word in ["temperature", "weather", "forecast"]
-                )
+    try:
+        result = await aget_tmrw_weather_tool("New York, NY")
 
-        except Exception:
-            # If direct API call fails, verify the mock is set up correctly
-            assert "timelines" in mock_tomorrow_io_response
-            assert "hourly" in mock_tomorrow_io_response["timelines"]
+        # Should handle error gracefully (return None or error message)
+        if result is not None:
+            assert isinstance(result, (str, dict))
+            if isinstance(result, str):
+                # Error messages should be informative
+                assert len(result) > 0
 
+    except Exception as e:
+        # If exceptions are raised, they should be appropriate
+        assert isinstance(e, Exception)
+        # Should not crash the entire application
+        assert len(str(e)) > 0
 
-@pytest.mark.asyncio
-async def test_tomorrow_io_api_error_handling(requests_mock):
-    """
-    Tests error handling for Tomorrow.io API failures.
-    """
-    from tomorrow_io_client.client import get_tmrw_weather_tool
-
-    # Test various error scenarios
-    error_scenarios = [
-        (400, "Bad Request"),
-        (401, "Unauthorized"),
-        (403, "Forbidden"),
-        (429, "Too Many Requests"),
-        (500, "Internal Server Error"),
-        (503, "Service Unavailable"),
-    ]
 
-    for status_code, error_message in error_scenarios:
-        # Mock API to return error
-        requests_mock.get(
-            "https://api.tomorrow.io/v4/weather/forecast",
-            status_code=status_code,
-            text=error_message,
-        )
-
-        with patch.dict(
-            "os.environ",
-            {
-                "TOMORROW_IO_API_KEY": TEST_TOMORROW_IO_API_KEY
-            },  # pragma: allowlist secret
-        ):  # pragma: allowlist secret
-
-            try:
-                result = get_tmrw_weather_tool("New York, NY")
-
-                # Should handle error gracefully (return None or error message)
-                if result is not None:
-                    assert isinstance(result, (str, dict))
-                    if isinstance(result, str):
-                        # Error messages should be informative
-                        assert len(result) > 0
-
-            except Exception as e:
-                # If exceptions are raised, they should be appropriate
-                assert isinstance(e, Exception)
-                # Should not crash the entire application
-                assert len(str(e)) > 0
-
-
-@pytest.mark.asyncio
 async def test_google_search_api_integration(
-    setup_api_mocks, mock_google_search_response
+    setup_api_mocks, mock_google_search_response, google_search_tool
 ):
     """
     Tests the complete integration with Google Search API.
     """
-    # Test Google Search integration through the agent
-    from google_search_agent.agent import create_google_search_agent
-
-    agent = create_google_search_agent()
-
-    # Get search tools
-    search_tools = [tool for tool in agent.tools if "search" in tool.name.lower()]
-
-    if len(search_tools) > 0:
-        search_tool = search_tools[0]
-
-        with patch.dict(
-            "os.environ", {"GOOGLE_API_KEY": "test_api_key"}  # pragma: allowlist secret
-        ):
-            try:
-                # Test search functionality using run_async method
-                result = await search_tool.run_async(query="Paris attractions")
-
-                # Verify result structure
-                if result is not None:
-                    if isinstance(result, dict):
-                        # Should contain search results
-                        assert "items" in result or "results" in str(result).lower()
-                    elif isinstance(result, str):
-                        # Should be formatted search results
-                        assert len(result) > 0
-                        assert any(
-                            word in result.lower()
-                            for word in ["paris", "attractions", "search"]
-                        )
-
-            except Exception:
-                # Verify tool is properly configured
-                assert callable(search_tool.run_async)
-
-
-@pytest.mark.asyncio
-async def test_google_search_api_error_handling(requests_mock):
+    # Test Google Search integration through the session's search agent
+    if google_search_tool is not None:
+        search_tool = google_search_tool
+
+        try:
+            # Test search functionality using run_async method
+            result = await search_tool.run_async(query="Paris attractions")
+
+            # Verify result structure
+            if result is not None:
+                if isinstance(result, dict):
+                    # Should contain search results
+                    assert "items" in result or "results" in str(result).lower()
+                elif isinstance(result, str):
+                    # Should be formatted search results
+                    assert len(result) > 0
+                    assert SEARCH_WORDS.search(result)
+
+        except Exception:
+            # Verify tool is properly configured
+            assert callable(search_tool.run_async)
+
+
+@pytest.mark.parametrize("status_code,error_response", SEARCH_ERROR_SCENARIOS)
+async def test_google_search_api_error_handling(
+    mock_search_api, google_search_tool, status_code, error_response
+):
     """
     Tests error handling for Google Search API failures.
     """
-    from google_search_agent.agent import create_google_search_agent
-
     # Mock API to return errors
-    error_scenarios = [
-        (400, '{"error": {"message": "Invalid request"}}'),
-        (403, '{"error": {"message": "Quota exceeded"}}'),
-        (500, '{"error": {"message": "Internal error"}}'),
-    ]
-
-    for status_code, error_response in error_scenarios:
-        requests_mock.get(
-            "https://www.googleapis.com/customsearch/v1",
-            status_code=status_code,
-            text=error_response,
-        )
-
-        agent = create_google_search_agent()
-        search_tools = [tool for tool in agent.tools if "search" in tool.name.lower()]
+    mock_search_api(
+        status_code=status_code,
+        text=error_response,
+    )
 
-        if len(search_tools) > 0:
-            search_tool = search_tools[0]
+    if google_search_tool is not None:
+        search_tool = google_search_tool
 
-            with patch.dict(
-                "os.environ",
-                {"GOOGLE_API_KEY": "test_api_key"},  # pragma: allowlist secret
-            ):
-                try:
-                    result = await search_tool.run_async(query="test query")
+        try:
+            result = await search_tool.run_async(query="test query")
 
-                    # Should handle errors gracefully
-                    if result is not None:
-                        assert isinstance(result, (str, dict))
+            # Should handle errors gracefully
+            if result is not None:
+                assert isinstance(result, (str, dict))
 
-                except Exception as e:
-                    # Should provide meaningful error information
-                    assert isinstance(e, Exception)
+        except Exception as e:
+            # Should provide meaningful error information
+            assert isinstance(e, Exception)
 
 
-@pytest.mark.asyncio
-async def test_api_timeout_handling(requests_mock):
+async def test_api_timeout_handling(mock_weather_api):
     """
     Tests that API timeouts are handled appropriately.
     """
-    from tomorrow_io_client.client import get_tmrw_weather_tool
-
     # Mock API to simulate timeout
-    requests_mock.get(
-        "https://api.tomorrow.io/v4/weather/forecast", exc=Timeout("Request timed out")
-    )
+    mock_weather_api(exc=Timeout("Request timed out"))
 
-    with patch.dict(
-        "os.environ",
-        {"TOMORROW_IO_API_KEY": TEST_TOMORROW_IO_API_KEY},  # pragma: allowlist secret
-    ):
-
-        try:
-            result = get_tmrw_weather_tool("New York, NY")
+    try:
+        result = await aget_tmrw_weather_tool("New York, NY")
 
-            # Should handle timeout gracefully
-            if result is not None:
-                assert isinstance(result, (str, dict))
-                if isinstance(result, str):
-                    # Timeout error message should be informative
-                    assert len(result) > 0
+        # Should handle timeout gracefully
+        if result is not None:
+            assert isinstance(result, (str, dict))
+            if isinstance(result, str):
+                # Timeout error message should be informative
+                assert len(result) > 0
 
-        except Timeout:
-            # Timeout exceptions are acceptable if not caught internally
-            pass
-        except Exception as e:
-            # Other exceptions should be meaningful
-            assert "timeout" in str(e).lower() or "connection" in str(e).lower()
+    except Timeout:
+        # Timeout exceptions are acceptable if not caught internally
+        pass
+    except Exception as e:
+        # Other exceptions should be meaningful
+        assert "timeout" in str(e).lower() or "connection" in str(e).lower()
 
 
-@pytest.mark.asyncio
-async def test_api_connection_error_handling(requests_mock):
+async def test_api_connection_error_handling(mock_weather_api):
     """
     Tests handling of network connection errors.
     """
-    from tomorrow_io_client.client import get_tmrw_weather_tool
-
     # Mock connection error
-    requests_mock.get(
-        "https://api.tomorrow.io/v4/weather/forecast",
+    mock_weather_api(
         exc=ConnectionError("Connection failed"),
     )
 
-    with patch.dict(
-        "os.environ",
-        {"TOMORROW_IO_API_KEY": TEST_TOMORROW_IO_API_KEY},  # pragma: allowlist secret
-    ):
+    try:
+        result = await aget_tmrw_weather_tool("New York, NY")
 
-        try:
-            result = get_tmrw_weather_tool("New York, NY")
-
-            # Should handle connection errors gracefully
-            if result is not None:
-                assert isinstance(result, (str, dict))
-                if isinstance(result, str):
-                    assert len(result) > 0
+        # Should handle connection errors gracefully
+        if result is not None:
+            assert isinstance(result, (str, dict))
+            if isinstance(result, str):
+                assert len(result) > 0
 
-        except ConnectionError:
-            # Connection errors are acceptable if not caught internally
-            pass
-        except Exception as e:
-            # Should provide meaningful error information
-            assert "connection" in str(e).lower() or "network" in str(e).lower()
+    except ConnectionError:
+        # Connection errors are acceptable if not caught internally
+        pass
+    except Exception as e:
+        # Should provide meaningful error information
+        assert "connection" in str(e).lower() or "network" in str(e).lower()
 
 
-@pytest.mark.asyncio
-async def test_api_rate_limiting_handling(requests_mock):
+async def test_api_rate_limiting_handling(mock_weather_api):
     """
     Tests handling of API rate limiting (429 status code).
     """
-    from tomorrow_io_client.client import get_tmrw_weather_tool
-
     # Mock rate limiting response
-    requests_mock.get(
-        "https://api.tomorrow.io/v4/weather/forecast",
+    mock_weather_api(
         status_code=429,
         headers={"Retry-After": "60"},
         text="Rate limit exceeded",
     )
 
-    with patch.dict(
-        "os.environ",
-        {"TOMORROW_IO_API_KEY": TEST_TOMORROW_IO_API_KEY},  # pragma: allowlist secret
-    ):
-
-        try:
-            result = get_tmrw_weather_tool("New York, NY")
+    try:
+        result = await aget_tmrw_weather_tool("New York, NY")
 
-            # Should handle rate limiting gracefully
-            if result is not None:
-                assert isinstance(result, (str, dict))
-                if isinstance(result, str):
-                    # Should indicate rate limiting or service unavailability
-                    assert len(result) > 0
+        # Should handle rate limiting gracefully
+        if result is not None:
+            assert isinstance(result, (str, dict))
+            if isinstance(result, str):
+                # Should indicate rate limiting or service unavailability
+                assert len(result) > 0
 
-        except Exception as e:
-            # Rate limiting errors should be handled appropriately
-            assert (
-                "rate" in str(e).lower() or "limit" in str(e).lower() or "429" in str(e)
-            )
+    except Exception as e:
+        # Rate limiting errors should be handled appropriately
+        assert "rate" in str(e).lower() or "limit" in str(e).lower() or "429" in str(e)
 
 
-@pytest.mark.asyncio
-async def test_api_response_validation(requests_mock, mock_tomorrow_io_response):
+async def test_api_response_validation(mock_weather_api, mock_tomorrow_io_response):
     """
     Tests that API responses are properly validated.
     """
-    from tomorrow_io_client.client import get_tmrw_weather_tool
-
     # Test with valid response
-    requests_mock.get(
-        "https://api.tomorrow.io/v4/weather/forecast", json=mock_tomorrow_io_response
-    )
-
-    with patch.dict(
-        "os.environ",
-        {"TOMORROW_IO_API_KEY": TEST_TOMORROW_IO_API_KEY},  # pragma: allowlist secret
-    ):
+    mock_weather_api(json=mock_tomorrow_io_response)
 
-        try:
-            result = get_tmrw_weather_tool("New York, NY")
+    try:
+        result = await aget_tmrw_weather_tool("New York, NY")
 
-            if result is not None:
-                # Should be properly formatted
-                assert isinstance(result, (str, dict))
+        if result is not None:
+            # Should be properly formatted
+            assert isinstance(result, (str, dict))
 
-                if isinstance(result, dict):
-                    # Should have expected structure
-                    assert len(result) > 0
+            if isinstance(result, dict):
+                # Should have expected structure
+                assert len(result) > 0
 
-                elif isinstance(result, str):
-                    # Should contain weather information
-                    assert len(result) > 0
-                    assert any(
-                        word in result.lower()
-                        for word in ["temperature", "weather", "forecast"]
-                    )
+            elif isinstance(result, str):
+                # Should contain weather information
+                assert len(result) > 0
+                assert WEATHER_WORDS.search(result)
 
-        except Exception as e:
-            # Validation errors should be meaningful
-            assert len(str(e)) > 0
+    except Exception as e:
+        # Validation errors should be meaningful
+        assert len(str(e)) > 0
 
 
-@pytest.mark.asyncio
-async def test_api_malformed_response_handling(requests_mock):
+@pytest.mark.parametrize("malformed_response", MALFORMED_RESPONSES)
+async def test_api_malformed_response_handling(mock_weather_api, malformed_response):
     """
     Tests handling of malformed API responses.
     """
-    from tomorrow_io_client.client import get_tmrw_weather_tool
-
-    # Test various malformed responses
-    malformed_responses = [
-        "Not JSON",
-        '{"incomplete": json',
-        '{"empty": {}}',
-        '{"wrong_structure": ["array", "instead", "of", "object"]}',
-    ]
-
-    for malformed_response in malformed_responses:
-        requests_mock.get(
-            "https://api.tomorrow.io/v4/weather/forecast",
-            text=malformed_response,
-            headers={"content-type": "application/json"},
-        )
+    mock_weather_api(
+        text=malformed_response,
+        headers={"content-type": "application/json"},
+    )
 
-        with patch.dict(
-            "os.environ",
-            {
-                "TOMORROW_IO_API_KEY": TEST_TOMORROW_IO_API_KEY
-            },  # pragma: allowlist secret
-        ):
+    try:
+        result = await aget_tmrw_weather_tool("New York, NY")
 
-            try:
-                result = get_tmrw_weather_tool("New York, NY")
+        # Should handle malformed responses gracefully
+        if result is not None:
+            assert isinstance(result, (str, dict))
 
-                # Should handle malformed responses gracefully
-                if result is not None:
-                    assert isinstance(result, (str, dict))
+    except Exception as e:
+        # JSON parsing errors should be handled
+        assert isinstance(e, Exception)
 
-            except Exception as e:
-                # JSON parsing errors should be handled
-                assert isinstance(e, Exception)
 
+def _todays_forecast():
+    """Hourly Tomorrow.io payload for this afternoon in the local timezone
 
-@pytest.mark.asyncio
-async def test_concurrent_api_requests(setup_api_mocks):
+    The tool only summarizes hours that fall on today's local date, so the
+    timestamps are built from today rather than fixed.
     """
-    Tests that multiple concurrent API requests are handled properly.
+    local_tz = tzlocal.get_localzone()
+    today = datetime.now(local_tz).date()
+    return {
+        "timelines": {
+            "hourly": [
+                {
+                    "time": datetime.combine(today, time(hour), tzinfo=local_tz)
+                    .astimezone(timezone.utc)
+                    .isoformat(),
+                    "values": {"temperature": 75, "precipitationProbability": 10},
+                }
+                for hour in (13, 14)
+            ]
+        }
+    }
+
+
+async def test_concurrent_api_requests(mock_weather_api, monkeypatch):
     """
-    from tomorrow_io_client.client import get_tmrw_weather_tool
-
-    with patch.dict(
-        "os.environ",
-        {"TOMORROW_IO_API_KEY": TEST_TOMORROW_IO_API_KEY},  # pragma: allowlist secret
-    ):
+    Tests that concurrent API requests overlap and each return a forecast.
+    """
+    mock_weather_api(json=_todays_forecast())
+
+    # New York, Los Angeles, Chicago and Houston; coordinates skip geocoding
+    locations = [
+        "40.7128,-74.0060",
+        "34.0522,-118.2437",
+        "41.8781,-87.6298",
+        "29.7604,-95.3698",
+    ]
 
-        # Create multiple concurrent requests
-        locations = ["New York", "Los Angeles", "Chicago", "Houston"]
+    # Every worker waits until all lookups have started, so the barrier breaks
+    # if they run one at a time. It sits in front of the sync tool because
+    # requests_mock serializes the HTTP sends themselves.
+    started = threading.Barrier(len(locations), timeout=5)
 
-        async def make_request(location):
-            try:
-                return get_tmrw_weather_tool(f"{location}, NY")
-            except Exception:
-                return None
+    def overlapping_tool(location):
+        started.wait()
+        return get_tmrw_weather_tool(location)
 
-        # Execute concurrent requests
-        results = await asyncio.gather(*[make_request(loc) for loc in locations])
+    monkeypatch.setattr(
+        "tomorrow_io_client.client.get_tmrw_weather_tool", overlapping_tool
+    )
 
-        # Should handle concurrent requests without issues
-        # At least some results should be successful
-        [r for r in results if r is not None]
+    results = await asyncio.gather(*map(aget_tmrw_weather_tool, locations))
 
-        # Even if some fail, the system should remain stable
-        assert len(results) == len(locations)
+    assert [result["location"] for result in results] == locations
+    for result in results:
+        assert isinstance(result, dict)
+        assert result["status"] == "success", result
@@ -6,79 +6,79 @@ testing of the chatbot application.
 """
 
 import pytest
-from unittest.mock import Mock, MagicMock, patch
-
-
-@pytest.fixture
-def mock_streamlit():
-    """Mock Streamlit module and its components."""
-    with patch("streamlit") as mock_st:
-        # Mock session state
-        mock_st.session_state = {}
-
-        # Mock UI components
-        mock_st.set_page_config = Mock()
-        mock_st.title = Mock()
-        mock_st.markdown = Mock()
-        mock_st.sidebar = MagicMock()
-        mock_st.chat_message = MagicMock()
-        mock_st.chat_input = Mock()
-        mock_st.button = Mock()
-        mock_st.columns = Mock(return_value=[Mock(), Mock()])
-        mock_st.empty = Mock()
-        mock_st.success = Mock()
-        mock_st.warning = Mock()
-        mock_st.error = Mock()
-        mock_st.info = Mock()
-        mock_st.metric = Mock()
-        mock_st.download_button = Mock()
-        mock_st.subheader = Mock()
-        mock_st.caption = Mock()
-        mock_st.rerun = Mock()
-
-        yield mock_st
-
-
-@pytest.fixture
-def sample_messages():
-    """Sample chat messages for testing."""
-    return [
+from types import SimpleNamespace
+from unittest.mock import DEFAULT, Mock, patch
+
+# Read-only chat data, built once and shared by every test that requests it
+_SAMPLE_MESSAGES = (
+    {
+        "role": "assistant",
+        "content": "Hello! I'm your assistant.",
+        "timestamp": "2025-08-17T10:00:00.000Z",
+        "agent": "supervisor",
+    },
+    {
+        "role": "user",
+        "content": "What's the weather like?",
+        "timestamp": "2025-08-17T10:01:00.000Z",
+        "agent": "user",
+    },
+    {
+        "role": "assistant",
+        "content": "The weather is sunny today.",
+        "timestamp": "2025-08-17T10:01:30.000Z",
+        "agent": "supervisor",
+    },
+)
+
+_CONVERSATION_EXPORT_DATA = {
+    "conversation_id": "chat_1629123456",
+    "export_timestamp": "2025-08-17T10:00:00.000Z",
+    "message_count": 3,
+    "messages": (
         {
             "role": "assistant",
-            "content": "Hello! I'm your assistant.",
-            "timestamp": "2025-08-17T10:00:00.000Z",
+            "content": "Hello! How can I help you?",
+            "timestamp": "2025-08-17T09:58:00.000Z",
             "agent": "supervisor",
         },
         {
             "role": "user",
-            "content": "What's the weather like?",
-            "timestamp": "2025-08-17T10:01:00.000Z",
+            "content": "Tell me about the weather",
+            "timestamp": "2025-08-17T09:59:00.000Z",
             "agent": "user",
         },
         {
             "role": "assistant",
-            "content": "The weather is sunny today.",
-            "timestamp": "2025-08-17T10:01:30.000Z",
+            "content": "The weather forecast shows sunny skies today.",
+            "timestamp": "2025-08-17T10:00:00.000Z",
             "agent": "supervisor",
         },
-    ]
+    ),
+}
+
+# The event mock_runner's run_async yields; shared, so its actions are a tuple
+_MOCK_EVENT = SimpleNamespace(actions=())
+
+
+@pytest.fixture(scope="session")
+def sample_messages():
+    """Sample chat messages for testing; shared, so copy before mutating."""
+    return _SAMPLE_MESSAGES
 
 
 @pytest.fixture
 def mock_supervisor_agent():
-    """Mock supervisor agent for testing."""
-    mock_agent = Mock()
-    mock_agent.name = "supervisor"
-    return mock_agent
+    """Stand-in supervisor agent; a plain namespace, as nothing asserts on it."""
+    return SimpleNamespace(name="supervisor")
 
 
 @pytest.fixture
 def mock_demo_agent():
-    """Mock demo agent for testing."""
-    mock_agent = Mock()
-    mock_agent.name = "Demo Agent"
-    mock_agent.chat = Mock(return_value="Demo response")
-    return mock_agent
+    """Stand-in demo agent whose chat() always answers "Demo response"."""
+    return SimpleNamespace(
+        name="Demo Agent", chat=lambda *args, **kwargs: "Demo response"
+    )
 
 
 @pytest.fixture
@@ -96,71 +96,85 @@ def mock_runner():
     mock_runner = Mock()
     mock_runner.session_service = Mock()
 
-    # Mock async iterator for run_async
     async def mock_run_async(*args, **kwargs):
-        # Yield mock events
-        mock_event = Mock()
-        mock_event.actions = []
-        yield mock_event
+        yield _MOCK_EVENT
 
     mock_runner.run_async = mock_run_async
     return mock_runner
 
 
 @pytest.fixture
-def mock_environment_variables():
-    """Mock environment variables and imports."""
-    with patch.dict(
-        "os.environ",
-        {
-            "GOOGLE_API_KEY": "test_key",  # pragma: allowlist secret
-            "TOMORROW_IO_API_KEY": (
-                "test_weather_key_for_streamlit_tests_1234567890"
-            ),  # pragma: allowlist secret
-        },
+def mock_environment_variables(monkeypatch):
+    """Set test API keys for the duration of a test."""
+    monkeypatch.setenv("GOOGLE_API_KEY", "test_key")  # pragma: allowlist secret
+    monkeypatch.setenv(
+        "TOMORROW_IO_API_KEY",
+        "test_weather_key_for_streamlit_tests_1234567890",  # pragma: allowlist secret
+    )
+
+
+@pytest.fixture
+def app_mocks():
+    """Patch the components app.main orchestrates, plus its logger.
+
+    Yields the mocks keyed by attribute name, e.g. ``app_mocks["load_custom_css"]``.
+    """
+    with patch.multiple(
+        "app",
+        load_custom_css=DEFAULT,
+        initialize_session_state=DEFAULT,
+        render_sidebar=DEFAULT,
+        render_chat_interface=DEFAULT,
+        handle_user_input=DEFAULT,
+        logger=DEFAULT,
+    ) as mocks:
+        yield mocks
+
+
+@pytest.fixture
+def user_input_env():
+    """Patch what handle_user_input touches, with an empty chat and no throttle.
+
+    Yields the mocks by name; set ``chat_input.return_value`` to the message
+    to submit. The chatbot manager answers "Test response" as "supervisor".
+    """
+    manager = Mock()
+    manager.get_primary_agent.return_value = "supervisor"
+    manager.get_agent_response.return_value = "Test response"
+    with (
+        patch("streamlit.session_state") as session_state,
+        patch("streamlit.chat_input") as chat_input,
+        patch("streamlit.chat_message"),
+        patch("streamlit.toast") as toast,
+        patch("ui.components.show_typing_indicator") as typing,
     ):
-        yield
+        session_state.messages = []
+        session_state.chatbot_manager = manager
+        session_state.last_request_time = 0
+        yield {
+            "session_state": session_state,
+            "chat_input": chat_input,
+            "toast": toast,
+            "typing": typing,
+            "manager": manager,
+        }
 
 
 @pytest.fixture
 def mock_logging():
-    """Mock logging to capture log messages during tests."""
+    """Mock logging to capture log messages during tests.
+
+    The patched logger is a MagicMock, so ``debug``/``info``/... record calls
+    as soon as they are used.
+    """
     with patch("app.logger") as mock_logger:
-        mock_logger.debug = Mock()
-        mock_logger.info = Mock()
-        mock_logger.warning = Mock()
-        mock_logger.error = Mock()
         yield mock_logger
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def conversation_export_data():
-    """Sample conversation data for export testing."""
-    return {
-        "conversation_id": "chat_1629123456",
-        "export_timestamp": "2025-08-17T10:00:00.000Z",
-        "message_count": 3,
-        "messages": [
-            {
-                "role": "assistant",
-                "content": "Hello! How can I help you?",
-                "timestamp": "2025-08-17T09:58:00.000Z",
-                "agent": "supervisor",
-            },
-            {
-                "role": "user",
-                "content": "Tell me about the weather",
-                "timestamp": "2025-08-17T09:59:00.000Z",
-                "agent": "user",
-            },
-            {
-                "role": "assistant",
-                "content": "The weather forecast shows sunny skies today.",
-                "timestamp": "2025-08-17T10:00:00.000Z",
-                "agent": "supervisor",
-            },
-        ],
-    }
+    """Sample conversation data for export testing; shared, so copy first."""
+    return _CONVERSATION_EXPORT_DATA
 
 
 @pytest.fixture
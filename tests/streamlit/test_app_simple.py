@@ -4,16 +4,21 @@ Simple, focused tests for app.py targeting high coverage.
 Tests the functions that can be easily tested without complex mocking.
 """
 
-from unittest.mock import Mock, patch
-import sys
-import os
+from unittest.mock import MagicMock, Mock, patch
+import pytest
+import time
 import json
+import app
 import ui.backend as backend
-import ui.components as components  # noqa: F401
-import ui.styles as styles  # noqa: F401
-
-# Add the project root to the path
-sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(__file__))))
+from app import main
+from ui.components import (
+    export_chat_history,
+    handle_user_input,
+    render_chat_interface,
+    render_sidebar,
+    show_typing_indicator,
+)
+from ui.styles import load_custom_css
 
 
 class TestModuleLevel:
@@ -21,8 +26,6 @@ class TestModuleLevel:
 
     def test_module_imports(self):
         """Test that the module imports successfully."""
-        import app
-
         # Basic checks
         assert hasattr(app, "main")
         assert hasattr(app, "load_custom_css")
@@ -41,7 +44,6 @@ class TestCSS:
     @patch("streamlit.markdown")
     def test_load_custom_css(self, mock_markdown):
         """Test CSS loading function."""
-        from ui.styles import load_custom_css
 
         load_custom_css()
 
@@ -67,8 +69,6 @@ class TestExport:
             {"role": "user", "content": "Hi", "timestamp": "2025-08-17T10:00:00Z"}
         ]
 
-        from ui.components import export_chat_history
-
         export_chat_history()
 
         mock_download.assert_called_once()
@@ -84,7 +84,6 @@ class TestExport:
     @patch("streamlit.error")
     def test_export_error(self, mock_error):
         """Test export error handling."""
-        from ui.components import export_chat_history
 
         export_chat_history()
 
@@ -100,18 +99,10 @@ class TestTypingIndicator:
     @patch("time.sleep")
     def test_show_typing_indicator(self, mock_sleep, mock_empty):
         """Test typing indicator functionality."""
-        mock_placeholder = Mock()
+        # MagicMock supports the placeholder's container() context manager
+        mock_placeholder = MagicMock()
         mock_empty.return_value = mock_placeholder
 
-        # Setup container context manager
-        mock_container = Mock()
-        mock_placeholder.container.return_value.__enter__ = Mock(
-            return_value=mock_container
-        )
-        mock_placeholder.container.return_value.__exit__ = Mock(return_value=None)
-
-        from ui.components import show_typing_indicator
-
         show_typing_indicator()
 
         mock_empty.assert_called_once()
@@ -122,51 +113,28 @@ class TestTypingIndicator:
 class TestMainFunction:
     """Test main function."""
 
-    @patch("app.handle_user_input")
-    @patch("app.render_chat_interface")
-    @patch("app.render_sidebar")
-    @patch("app.initialize_session_state")
-    @patch("app.load_custom_css")
-    @patch("app.logger")
-    def test_main_success(
-        self, mock_logger, mock_css, mock_init, mock_sidebar, mock_chat, mock_input
-    ):
+    def test_main_success(self, app_mocks):
         """Test successful main execution."""
-        from app import main
 
         main()
 
         # All functions should be called
-        mock_css.assert_called_once()
-        mock_init.assert_called_once()
-        mock_sidebar.assert_called_once()
-        mock_chat.assert_called_once()
-        mock_input.assert_called_once()
-
-    @patch("app.handle_user_input")
-    @patch("app.render_chat_interface")
-    @patch("app.render_sidebar")
-    @patch("app.initialize_session_state")
-    @patch("app.load_custom_css")
+        for name in (
+            "load_custom_css",
+            "initialize_session_state",
+            "render_sidebar",
+            "render_chat_interface",
+            "handle_user_input",
+        ):
+            app_mocks[name].assert_called_once()
+
     @patch("streamlit.error")
     @patch("streamlit.info")
-    @patch("app.logger")
-    def test_main_error(
-        self,
-        mock_logger,
-        mock_info,
-        mock_error,
-        mock_css,
-        mock_init,
-        mock_sidebar,
-        mock_chat,
-        mock_input,
-    ):
+    def test_main_error(self, mock_info, mock_error, app_mocks):
         """Test main function error handling."""
-        from app import main
 
         # Make a function fail
-        mock_css.side_effect = Exception("CSS error")
+        app_mocks["load_custom_css"].side_effect = Exception("CSS error")
 
         main()
 
@@ -205,13 +173,6 @@ class TestChatInterface:
             }
         ]
 
-        # Mock chat message context manager
-        mock_context = Mock()
-        mock_chat_message.return_value.__enter__ = Mock(return_value=mock_context)
-        mock_chat_message.return_value.__exit__ = Mock(return_value=None)
-
-        from ui.components import render_chat_interface
-
         render_chat_interface()
 
         mock_title.assert_called_once()
@@ -233,12 +194,6 @@ class TestSidebar:
         mock_session_state.messages = []
         mock_session_state.conversation_id = "test_123"
 
-        # Mock sidebar context manager
-        mock_sidebar.__enter__ = Mock()
-        mock_sidebar.__exit__ = Mock()
-
-        from ui.components import render_sidebar
-
         render_sidebar()
 
         # Should check primary agent
@@ -248,131 +203,77 @@ class TestSidebar:
 class TestUserInput:
     """Test user input handling."""
 
-    @patch("streamlit.session_state")
-    @patch("streamlit.chat_input")
-    @patch("streamlit.chat_message")
-    @patch("ui.components.show_typing_indicator")
-    def test_handle_user_input_no_input(
-        self, mock_typing, mock_chat_message, mock_chat_input, mock_session_state
-    ):
-        """Test handling when no user input."""
-        mock_session_state.messages = []
-        mock_chat_input.return_value = None  # No input
-
-        from ui.components import handle_user_input
-
-        handle_user_input()
-
-        # Should not add any messages
-        assert len(mock_session_state.messages) == 0
-        mock_typing.assert_not_called()
-
-    @patch("streamlit.session_state")
-    @patch("streamlit.chat_input")
-    @patch("streamlit.chat_message")
-    @patch("ui.components.show_typing_indicator")
-    def test_handle_user_input_with_input(
-        self, mock_typing, mock_chat_message, mock_chat_input, mock_session_state
-    ):
-        """Test handling with user input."""
-        mock_manager = Mock()
-        mock_manager.get_primary_agent.return_value = "supervisor"
-        mock_manager.get_agent_response.return_value = "Test response"
-
-        mock_session_state.messages = []
-        mock_session_state.chatbot_manager = mock_manager
-        mock_session_state.last_request_time = 0
-        mock_chat_input.return_value = "Test message"
-
-        # Mock chat message context manager
-        mock_context = Mock()
-        mock_chat_message.return_value.__enter__ = Mock(return_value=mock_context)
-        mock_chat_message.return_value.__exit__ = Mock(return_value=None)
-
-        from ui.components import handle_user_input
-
-        handle_user_input()
-
-        # Should add user and assistant messages
-        assert len(mock_session_state.messages) == 2
-        assert mock_session_state.messages[0]["role"] == "user"
-        assert mock_session_state.messages[0]["content"] == "Test message"
-        assert mock_session_state.messages[1]["role"] == "assistant"
-        assert mock_session_state.messages[1]["content"] == "Test response"
-
-        mock_typing.assert_called_once()
-        mock_manager.get_agent_response.assert_called_once_with(
-            "supervisor", "Test message"
-        )
-
-    @patch("streamlit.session_state")
-    @patch("streamlit.chat_input")
-    @patch("streamlit.toast")
-    def test_handle_user_input_rate_limited(
-        self, mock_toast, mock_chat_input, mock_session_state
-    ):
-        """Test that rate limiting prevents frequent requests."""
-        import time
-
-        mock_session_state.last_request_time = time.time()
-        mock_chat_input.return_value = "Test message"
-
-        from ui.components import handle_user_input
-
-        handle_user_input()
-
-        mock_toast.assert_called_once_with(
-            "You are sending requests too quickly. Please wait a moment."
-        )
-
-    @patch("streamlit.session_state")
-    @patch("streamlit.chat_input")
-    @patch("streamlit.toast")
-    def test_handle_user_input_too_long(
-        self, mock_toast, mock_chat_input, mock_session_state
-    ):
-        """Test that long inputs are rejected."""
-        mock_session_state.last_request_time = 0
-        mock_chat_input.return_value = "a" * 1025
-
-        from ui.components import handle_user_input
-
-        handle_user_input()
-
-        mock_toast.assert_called_once_with(
-            "Error: Input is too long. Please limit your query to 1024 characters."
-        )
-
-    @patch("streamlit.session_state")
-    @patch("streamlit.chat_input")
-    @patch("streamlit.chat_message")
-    @patch("ui.components.show_typing_indicator")
-    def test_handle_user_input_sanitization(
-        self, mock_typing, mock_chat_message, mock_chat_input, mock_session_state
+    @pytest.mark.parametrize(
+        "user_input, recent_request, expected_toast, expected_prompt",
+        [
+            # No input: nothing happens
+            (None, False, None, None),
+            # Plain input reaches the agent unchanged
+            ("Test message", False, None, "Test message"),
+            # A request right after the previous one is throttled
+            (
+                "Test message",
+                True,
+                "You are sending requests too quickly. Please wait a moment.",
+                None,
+            ),
+            # Over-long input is rejected
+            (
+                "a" * 1025,
+                False,
+                "Error: Input is too long. Please limit your query to 1024 "
+                "characters.",
+                None,
+            ),
+            # HTML is escaped before it is stored or sent to the agent
+            (
+                "<script>alert('XSS')</script>",
+                False,
+                None,
+                "&lt;script&gt;alert(&#x27;XSS&#x27;)&lt;/script&gt;",
+            ),
+        ],
+        ids=["no_input", "with_input", "rate_limited", "too_long", "sanitization"],
+    )
+    def test_handle_user_input(
+        self,
+        user_input_env,
+        user_input,
+        recent_request,
+        expected_toast,
+        expected_prompt,
     ):
-        """Test that user input is sanitized."""
-        mock_manager = Mock()
-        mock_manager.get_primary_agent.return_value = "supervisor"
-        mock_manager.get_agent_response.return_value = "Test response"
-        mock_session_state.messages = []
-        mock_session_state.chatbot_manager = mock_manager
-        mock_session_state.last_request_time = 0
-        mock_chat_input.return_value = "<script>alert('XSS')</script>"
-
-        mock_context = Mock()
-        mock_chat_message.return_value.__enter__ = Mock(return_value=mock_context)
-        mock_chat_message.return_value.__exit__ = Mock(return_value=None)
-
-        from ui.components import handle_user_input
+        """Test how user input is throttled, validated, sanitized and answered."""
+        session_state = user_input_env["session_state"]
+        manager = user_input_env["manager"]
+        if recent_request:
+            session_state.last_request_time = time.time()
+        user_input_env["chat_input"].return_value = user_input
 
         handle_user_input()
 
-        # Check that the sanitized message is passed to the agent
-        sanitized_message = "&lt;script&gt;alert(&#x27;XSS&#x27;)&lt;/script&gt;"
-        mock_manager.get_agent_response.assert_called_once_with(
-            "supervisor", sanitized_message
-        )
-        assert mock_session_state.messages[0]["content"] == sanitized_message
+        if expected_toast is None:
+            user_input_env["toast"].assert_not_called()
+        else:
+            user_input_env["toast"].assert_called_once_with(expected_toast)
+
+        if expected_prompt is None:
+            # Should not add any messages
+            assert session_state.messages == []
+            user_input_env["typing"].assert_not_called()
+            manager.get_agent_response.assert_not_called()
+        else:
+            # Should add user and assistant messages
+            assert [m["role"] for m in session_state.messages] == [
+                "user",
+                "assistant",
+            ]
+            assert session_state.messages[0]["content"] == expected_prompt
+            assert session_state.messages[1]["content"] == "Test response"
+            user_input_env["typing"].assert_called_once()
+            manager.get_agent_response.assert_called_once_with(
+                "supervisor", expected_prompt
+            )
 
 
 # Test some edge cases to increase coverage
@@ -385,7 +286,7 @@ class TestEdgeCases:
             patch("streamlit.session_state") as mock_session_state,
             patch("streamlit.title"),
             patch("streamlit.markdown"),
-            patch("streamlit.chat_message") as mock_chat_message,
+            patch("streamlit.chat_message"),
         ):
 
             # Test with invalid timestamp
@@ -398,12 +299,6 @@ class TestEdgeCases:
                 }
             ]
 
-            mock_context = Mock()
-            mock_chat_message.return_value.__enter__ = Mock(return_value=mock_context)
-            mock_chat_message.return_value.__exit__ = Mock(return_value=None)
-
-            from app import render_chat_interface
-
             # Should not raise exception
             render_chat_interface()
 
@@ -439,12 +334,6 @@ class TestEdgeCases:
                 },
             ]
 
-            mock_context = Mock()
-            mock_chat_message.return_value.__enter__ = Mock(return_value=mock_context)
-            mock_chat_message.return_value.__exit__ = Mock(return_value=None)
-
-            from ui.components import render_chat_interface
-
             render_chat_interface()
 
             # Should call chat_message for each message
@@ -1,50 +1,76 @@
 import types
+import pytest
 import streamlit as st
 import ui.backend as backend
 
 
-class DummySession(dict):
-    """Minimal session_state that supports both dict and attribute access."""
+class DummySession(types.SimpleNamespace):
+    """Minimal session_state that supports both dict and attribute access.
 
-    def __getattr__(self, name):
-        try:
-            return self[name]
-        except KeyError:
-            raise AttributeError(name)
+    Attributes live in the namespace's own ``__dict__``; only the dict-style
+    protocol is forwarded to it.
+    """
 
-    def __setattr__(self, name, value):
-        self[name] = value
+    def __contains__(self, key):
+        return key in self.__dict__
 
+    def __getitem__(self, key):
+        return self.__dict__[key]
 
-def test_create_demo_agent_and_chat():
-    # Use __new__ to avoid heavy initialization in __init__
-    mgr = backend.ChatbotManager.__new__(backend.ChatbotManager)
-    demo = mgr._create_demo_agent()
+    def __setitem__(self, key, value):
+        self.__dict__[key] = value
+
+
+@pytest.fixture(scope="module")
+def bare_mgr():
+    """One ChatbotManager for the module, built with __new__ to skip __init__
+
+    Tests that set attributes on it must do so through monkeypatch.
+    """
+    return backend.ChatbotManager.__new__(backend.ChatbotManager)
+
+
+def test_create_demo_agent_and_chat(bare_mgr):
+    demo = bare_mgr._create_demo_agent()
     resp = demo.chat("hello world")
     assert "Demo Agent Response" in resp
     assert "hello world" in resp
 
 
-def test_get_primary_agent_logic():
-    mgr = backend.ChatbotManager.__new__(backend.ChatbotManager)
+def test_get_primary_agent_logic(bare_mgr, monkeypatch):
     # When supervisor is present
-    mgr.agents = {"supervisor": object()}
-    assert mgr.get_primary_agent() == "supervisor"
+    monkeypatch.setattr(bare_mgr, "agents", {"supervisor": object()}, raising=False)
+    assert bare_mgr.get_primary_agent() == "supervisor"
 
     # When supervisor missing
-    mgr.agents = {"demo": object()}
-    assert mgr.get_primary_agent() == "demo"
+    monkeypatch.setattr(bare_mgr, "agents", {"demo": object()})
+    assert bare_mgr.get_primary_agent() == "demo"
+
 
+@pytest.fixture
+def force_demo_fallback(monkeypatch):
+    """Make new ChatbotManagers take the demo-agent fallback
 
-def test_initialize_session_state_creates_manager_and_messages(monkeypatch):
-    # Ensure new instances pick the demo fallback
+    supervisor_error only exists when the supervisor import failed, so it is
+    set too (and removed again afterwards) to avoid a NameError.
+    """
     monkeypatch.setattr(backend, "SUPERVISOR_AVAILABLE", False)
-    # Ensure the module-level supervisor_error exists to avoid NameError
-    backend.supervisor_error = "supervisor not present"
+    monkeypatch.setattr(
+        backend, "supervisor_error", "supervisor not present", raising=False
+    )
+
 
-    dummy = DummySession()
-    monkeypatch.setattr(st, "session_state", dummy, raising=False)
+@pytest.fixture
+def dummy_session(monkeypatch):
+    """An empty DummySession installed as st.session_state for one test"""
+    session = DummySession()
+    monkeypatch.setattr(st, "session_state", session)
+    return session
 
+
+def test_initialize_session_state_creates_manager_and_messages(
+    force_demo_fallback, dummy_session
+):
     # Call initialize - should populate messages and chatbot_manager
     backend.initialize_session_state()
 
@@ -55,33 +81,30 @@ def test_initialize_session_state_creates_manager_and_messages(monkeypatch):
     assert isinstance(st.session_state.chatbot_manager, backend.ChatbotManager)
 
 
-def test_extract_text_from_event_variants():
-    mgr = backend.ChatbotManager.__new__(backend.ChatbotManager)
-
-    # event with actions -> action.text
-    Action = types.SimpleNamespace
-    ev1 = types.SimpleNamespace(actions=[Action(text="from action")])
-    assert mgr._extract_text_from_event(ev1) == "from action"
-
-    # event with actions -> action.content.parts[].text
-    Part = types.SimpleNamespace
-    Content = types.SimpleNamespace
-    action_with_parts = Action(content=Content(parts=[Part(text="part text")]))
-    ev2 = types.SimpleNamespace(actions=[action_with_parts])
-    assert mgr._extract_text_from_event(ev2) == "part text"
-
-    # event with content.parts
-    ev3 = types.SimpleNamespace(content=Content(parts=[Part(text="content part")]))
-    assert mgr._extract_text_from_event(ev3) == "content part"
-
-    # event with content.text
-    ev4 = types.SimpleNamespace(content=Content(text="content text"))
-    assert mgr._extract_text_from_event(ev4) == "content text"
-
-    # event with direct text
-    ev5 = types.SimpleNamespace(text="direct text")
-    assert mgr._extract_text_from_event(ev5) == "direct text"
-
-    # event with no text
-    ev6 = types.SimpleNamespace()
-    assert mgr._extract_text_from_event(ev6) is None
+# Event shapes _extract_text_from_event handles, each with its expected text
+Event = Action = Content = Part = types.SimpleNamespace
+EVENT_TEXT_CASES = [
+    pytest.param(
+        Event(actions=[Action(text="from action")]), "from action", id="action_text"
+    ),
+    pytest.param(
+        Event(actions=[Action(content=Content(parts=[Part(text="part text")]))]),
+        "part text",
+        id="action_parts",
+    ),
+    pytest.param(
+        Event(content=Content(parts=[Part(text="content part")])),
+        "content part",
+        id="content_parts",
+    ),
+    pytest.param(
+        Event(content=Content(text="content text")), "content text", id="content_text"
+    ),
+    pytest.param(Event(text="direct text"), "direct text", id="direct_text"),
+    pytest.param(Event(), None, id="no_text"),
+]
+
+
+@pytest.mark.parametrize("event, expected", EVENT_TEXT_CASES)
+def test_extract_text_from_event(bare_mgr, event, expected):
+    assert bare_mgr._extract_text_from_event(event) == expected
@@ -4,98 +4,96 @@ Tests for demo_app.py
 Simple tests to cover the demo app functionality.
 """
 
-from unittest.mock import patch
+from unittest.mock import Mock, patch
+import runpy
+import subprocess
 import sys
 from pathlib import Path
 
+import pytest
 
-class TestDemoApp:
-    """Test demo app functionality."""
+from app_helpers import APP_PATH
+from demo_app import main
 
-    @patch("subprocess.run")
-    def test_main_success(self, mock_subprocess_run):
-        """Test successful demo app execution."""
-        from demo_app import main
 
-        # Mock successful subprocess run
-        mock_subprocess_run.return_value = None
+@pytest.fixture
+def mock_subprocess_run(monkeypatch):
+    """Replace subprocess.run with a Mock so no Streamlit process is started"""
+    run = Mock(return_value=None)
+    monkeypatch.setattr(subprocess, "run", run)
+    return run
 
-        result = main()
 
-        # Should return 0 for success
-        assert result == 0
+def test_main_success(monkeypatch):
+    """Test successful demo app execution."""
+    calls = []
+    monkeypatch.setattr(
+        subprocess, "run", lambda cmd, **kwargs: calls.append((cmd, kwargs))
+    )
 
-        # Should call subprocess.run with correct arguments
-        mock_subprocess_run.assert_called_once()
-        call_args = mock_subprocess_run.call_args[0][0]
+    result = main()
 
-        # Check command structure
-        assert call_args[0] == sys.executable
-        assert call_args[1] == "-m"
-        assert call_args[2] == "streamlit"
-        assert call_args[3] == "run"
-        assert "app.py" in call_args[4]
+    # Should return 0 for success
+    assert result == 0
 
-        # Should have check=True
-        assert mock_subprocess_run.call_args[1]["check"] is True
+    # Should call subprocess.run once, with check=True
+    assert len(calls) == 1
+    cmd, kwargs = calls[0]
+    assert kwargs["check"] is True
 
-    @patch("subprocess.run")
-    def test_main_keyboard_interrupt(self, mock_subprocess_run):
-        """Test demo app handling keyboard interrupt."""
-        from demo_app import main
+    # Check command structure
+    assert cmd[:4] == [sys.executable, "-m", "streamlit", "run"]
+    assert "app.py" in cmd[4]
 
-        # Mock KeyboardInterrupt
-        mock_subprocess_run.side_effect = KeyboardInterrupt()
 
-        with patch("builtins.print") as mock_print:
-            result = main()
+def test_main_keyboard_interrupt(mock_subprocess_run):
+    """Test demo app handling keyboard interrupt."""
+    # Mock KeyboardInterrupt
+    mock_subprocess_run.side_effect = KeyboardInterrupt()
 
-            # Should return 0 (successful shutdown)
-            assert result == 0
+    with patch("builtins.print") as mock_print:
+        result = main()
 
-            # Should print goodbye message
-            mock_print.assert_called_once_with(
-                "\n👋 Chatbot application stopped by user"
-            )
+        # Should return 0 (successful shutdown)
+        assert result == 0
 
-    @patch("subprocess.run")
-    def test_main_exception(self, mock_subprocess_run):
-        """Test demo app handling general exception."""
-        from demo_app import main
+        # Should print goodbye message
+        mock_print.assert_called_once_with("\n👋 Chatbot application stopped by user")
 
-        # Mock general exception
-        test_error = Exception("Test error")
-        mock_subprocess_run.side_effect = test_error
 
-        with patch("builtins.print") as mock_print:
-            result = main()
+def test_main_exception(mock_subprocess_run):
+    """Test demo app handling general exception."""
+    # Mock general exception
+    test_error = Exception("Test error")
+    mock_subprocess_run.side_effect = test_error
+
+    with patch("builtins.print") as mock_print:
+        result = main()
+
+        # Should return 1 for error
+        assert result == 1
 
-            # Should return 1 for error
-            assert result == 1
+        # Should print error message
+        mock_print.assert_called_once_with(
+            "❌ Error running the application: Test error"
+        )
 
-            # Should print error message
-            mock_print.assert_called_once_with(
-                "❌ Error running the application: Test error"
-            )
 
-    @patch("demo_app.main")
-    @patch("sys.exit")
-    def test_main_module_execution(self, mock_sys_exit, mock_main):
-        """Test that __name__ == '__main__' calls sys.exit(main())."""
-        mock_main.return_value = 42
+def test_main_module_execution(mock_subprocess_run):
+    """Test that running the script exits with main()'s return code."""
+    with pytest.raises(SystemExit) as exc_info:
+        runpy.run_module("demo_app", run_name="__main__")
 
-        # Import should trigger the if __name__ == "__main__" block
-        # We can't easily test this directly, so we test the components
+    assert exc_info.value.code == 0
+    mock_subprocess_run.assert_called_once()
 
-        # Verify the main function exists and is callable
-        from demo_app import main
 
-        assert callable(main)
+def test_app_path_construction(mock_subprocess_run):
+    """Test that main launches the repository's app.py."""
+    assert main() == 0
 
-    def test_app_path_construction(self):
-        """Test that app path is constructed correctly."""
-        # We can't easily mock Path inside the function, but we can verify
-        # the logic by checking that the function doesn't crash on import
-        # and that Path operations work
-        app_path = Path(__file__).parent.parent / "app.py"
-        assert app_path.name == "app.py"
+    # demo_app builds the path from its own location, so resolve it before
+    # comparing with the app.py next to the tests
+    cmd = mock_subprocess_run.call_args.args[0]
+    assert Path(cmd[4]).resolve() == APP_PATH
+    assert APP_PATH.is_file()